@@ -1,6 +1,5 @@
 # Copyright (C) 2024 Ningqi Wang (0xf3cd) <https://github.com/0xf3cd>
 
-import copy
 import functools
 
 from enum import IntFlag, unique
@@ -9,6 +8,7 @@ from typing import Final, TypedDict, Callable, Union, Iterable
 
 from ..Common import GanzhiData
 from ..Defines import Tiangan, Dizhi, Shishen, DizhiRelation
+from ..Bazi import Bazi
 from ..BaziChart import BaziChart
 from ..Transits import TransitOptions, TransitDatabase
 from ..Utils import BaziUtils, ShenshaUtils, TianganUtils, DizhiUtils
@@ -43,12 +43,16 @@ class ShenshaAnalysis(TypedDict):
 class AtBirthAnalysis:
   '''Analysis of Relationship at Birth / 出生时的亲密关系分析'''
   def __init__(self, chart: BaziChart) -> None:
-    self._chart: Final[BaziChart] = copy.deepcopy(chart)
+    # `BaziChart` is read-only, so it is shared rather than copied. `chart.bazi` returns a fresh copy on every access,
+    # so take it once here.
+    # `BaziChart` 是只读的，因此直接共享引用；`chart.bazi` 每次访问都会复制，故在此只取一次。
+    self._chart: Final[BaziChart] = chart
+    self._bazi: Final[Bazi] = chart.bazi
 
   @property
   def shensha(self) -> ShenshaAnalysis:
-    dm = self._chart.bazi.day_master
-    y_dz, m_dz, d_dz, h_dz = self._chart.bazi.four_dizhis
+    dm = self._bazi.day_master
+    y_dz, m_dz, d_dz, h_dz = self._bazi.four_dizhis
     return {
       'taohua' :  frozenset(find_shensha(ShenshaUtils.taohua,   ([y_dz],  [m_dz, d_dz, h_dz]), 
                                                                 ([d_dz],  [y_dz, m_dz, h_dz]))),
@@ -59,7 +63,7 @@ class AtBirthAnalysis:
 
   @property
   def day_master_relations(self) -> TianganUtils.TianganRelationDiscovery:
-    y_tg, m_tg, d_tg, h_tg = self._chart.bazi.four_tiangans
+    y_tg, m_tg, d_tg, h_tg = self._bazi.four_tiangans
     return TianganUtils.discover_mutual([d_tg], [y_tg, m_tg, h_tg])
   
   @property
@@ -70,7 +74,7 @@ class AtBirthAnalysis:
     #
     # With that being said, for AtBirth analysis, this problem doesn't exist.
     # Still use `discover` with `filter` though - it is expected to be equivalent to `discover_mutual([d_dz], [*other_three_dz])`
-    return DizhiUtils.discover(self._chart.bazi.four_dizhis).filter(
+    return DizhiUtils.discover(self._bazi.four_dizhis).filter(
       lambda _, combo : self._chart.house_of_relationship in combo
     )
   
@@ -79,8 +83,8 @@ class AtBirthAnalysis:
     '''Relations that the Star(s) of Relationship / 配偶星 / 婚姻星 has.'''
     stars = self._chart.relationship_stars
 
-    tg = TianganUtils.discover(self._chart.bazi.four_tiangans).filter(lambda _, combo : stars.tiangan in combo)
-    dz = DizhiUtils.discover(self._chart.bazi.four_dizhis).filter(lambda _, combo : any(dz in combo for dz in stars.dizhi))
+    tg = TianganUtils.discover(self._bazi.four_tiangans).filter(lambda _, combo : stars.tiangan in combo)
+    dz = DizhiUtils.discover(self._bazi.four_dizhis).filter(lambda _, combo : any(dz in combo for dz in stars.dizhi))
     return GanzhiData(tg, dz)
 
 
@@ -88,7 +92,8 @@ class AtBirthAnalysis:
 class TransitAnalysis:
   '''Analysis of Relationship at Transits / 流年大运等的亲密关系分析'''
   def __init__(self, chart: BaziChart) -> None:
-    self._chart: Final[BaziChart] = copy.deepcopy(chart)
+    self._chart: Final[BaziChart] = chart
+    self._bazi: Final[Bazi] = chart.bazi
     self._transit_db: Final[TransitDatabase] = TransitDatabase(chart)
 
   def support(self, gz_year: int, options: TransitOptions) -> bool:
@@ -115,9 +120,9 @@ class TransitAnalysis:
     transit_ganzhis = self._transit_db.ganzhis(gz_year, options)
     transit_dizhis = tuple(gz.dizhi for gz in transit_ganzhis)
 
-    dm = self._chart.bazi.day_master
-    y_dz = self._chart.bazi.year_pillar.dizhi
-    d_dz = self._chart.bazi.day_pillar.dizhi
+    dm = self._bazi.day_master
+    y_dz = self._bazi.year_pillar.dizhi
+    d_dz = self._bazi.day_pillar.dizhi
 
     return {
       'taohua' :  frozenset(find_shensha(ShenshaUtils.taohua,   ([y_dz, d_dz], transit_dizhis))),
@@ -143,7 +148,7 @@ class TransitAnalysis:
     transit_ganzhis = self._transit_db.ganzhis(gz_year, options)
     transit_tiangans = tuple(gz.tiangan for gz in transit_ganzhis)
 
-    return TianganUtils.discover_mutual([self._chart.bazi.day_master], transit_tiangans)
+    return TianganUtils.discover_mutual([self._bazi.day_master], transit_tiangans)
 
   def house_relations(self, gz_year: int, options: TransitOptions) -> DizhiUtils.DizhiRelationDiscovery:
     '''
@@ -163,7 +168,7 @@ class TransitAnalysis:
     transit_dizhis = [gz.dizhi for gz in transit_ganzhis]
 
     house = self._chart.house_of_relationship
-    bazi = self._chart.bazi
+    bazi = self._bazi
 
     result = DizhiUtils.discover_mutual([house], transit_dizhis)
 
@@ -171,16 +176,18 @@ class TransitAnalysis:
     # So `discover_mutual([house], transit_dizhis)` may contain incomplete results.
     #
     # Combos that contain 3 Dizhis are missing. So adding them manually.
+    #
+    # A wanted combo is made of one transit Dizhi, one at-birth Dizhi (except the house itself) and the house.
+    # Build all such triples once, so that filtering a combo is a single set lookup.
+    triples: frozenset[frozenset[Dizhi]] = frozenset(
+      frozenset((dz1, dz2, house))
+      for dz1 in transit_dizhis
+      for dz2 in (bazi.year_pillar.dizhi, bazi.month_pillar.dizhi, bazi.hour_pillar.dizhi)
+    )
 
     def __discover(rel: DizhiRelation):
       def __filter(rel: DizhiRelation, combo: frozenset[Dizhi]):
-        if len(combo) != 3:
-          return False
-        for dz1 in transit_dizhis:
-          for dz2 in [bazi.year_pillar.dizhi, bazi.month_pillar.dizhi, bazi.hour_pillar.dizhi]:
-            if combo == frozenset([dz1, dz2, house]):
-              return True
-        return False
+        return len(combo) == 3 and combo in triples
 
       return DizhiUtils.DizhiRelationDiscovery({
         rel : DizhiUtils.search(list(bazi.four_dizhis) + transit_dizhis, rel)
@@ -228,8 +235,8 @@ class TransitAnalysis:
     transit_tg = tuple(gz.tiangan for gz in transit_ganzhis)
     transit_dz = tuple(gz.dizhi for gz in transit_ganzhis)
 
-    at_birth_tg = self._chart.bazi.four_tiangans
-    at_birth_dz = self._chart.bazi.four_dizhis
+    at_birth_tg = self._bazi.four_tiangans
+    at_birth_dz = self._bazi.four_dizhis
 
     tg = TianganUtils.TianganRelationDiscovery({})
     dz = DizhiUtils.DizhiRelationDiscovery({})
@@ -261,7 +268,7 @@ class TransitAnalysis:
 
     assert self.support(gz_year, options)
   
-    f = functools.partial(BaziUtils.shishen, self._chart.bazi.day_master)
+    f = functools.partial(BaziUtils.shishen, self._bazi.day_master)
     transit_ganzhis = self._transit_db.ganzhis(gz_year, options)
 
     return GanzhiData(
@@ -297,7 +304,7 @@ class TransitAnalysis:
 class RelationshipAnalyzer:
   '''A thin wrapper of `AtBirthAnalysis` and `TransitAnalysis`.'''
   def __init__(self, chart: BaziChart) -> None:
-    self._chart: Final[BaziChart] = copy.deepcopy(chart)
+    self._chart: Final[BaziChart] = chart
 
   @property
   def at_birth(self) -> AtBirthAnalysis:
@@ -5,7 +5,6 @@
 #
 # Download the raw data from Hong Kong Observatory (hko) and encode the downloaded hko data.
 
-import requests
 import re
 from pathlib import Path
 from datetime import datetime
@@ -36,6 +35,9 @@ else:
 __sexagenary_cycle__: list[Ganzhi] = Ganzhi.list_sexagenary_cycle()
 
 def download_one_year_data(txt_path: Path, year: int) -> bool:
+  # `requests` is imported lazily - it dominates `import src` time, yet is only needed when downloading raw data.
+  # 延迟导入 `requests`：它占据了 `import src` 的大部分耗时，但只在下载原始数据时才需要。
+  import requests
   url = f'https://www.hko.gov.hk/tc/gts/time/calendar/text/files/T{year}c.txt'
   response = requests.get(url)
   if response.status_code == 200:
@@ -2,7 +2,9 @@
 
 import copy
 import inspect
+import functools
 
+from enum import Enum
 from datetime import datetime
 
 from typing import (
@@ -126,11 +128,13 @@ ClassPropertyType = TypeVar('ClassPropertyType')
 class classproperty(Generic[ClassPropertyType]):
   def __init__(self, fget: Callable[..., ClassPropertyType]) -> None:
     self._fget: Final[Callable[..., ClassPropertyType]] = fget
+    # Inspect the signature only once, since `inspect.signature` is far more expensive than the property access itself.
+    # 只检查一次函数签名，因为 `inspect.signature` 的开销远大于属性访问本身。
+    self._takes_owner: Final[bool] = len(inspect.signature(fget).parameters) > 0
   def __get__(self, instance, owner) -> ClassPropertyType:
-    sig = inspect.signature(self._fget)
-    if len(sig.parameters) == 0:
-      return self._fget()
-    return self._fget(owner)
+    if self._takes_owner:
+      return self._fget(owner)
+    return self._fget()
   def __set__(self, instance, value) -> None:
     raise AttributeError('Class property is read-only.')
 
@@ -150,14 +154,23 @@ class frozendict(Mapping[FrozenDictKeyType, FrozenDictValueType]):
   def __init__(self, data: Mapping[FrozenDictKeyType, FrozenDictValueType]) -> None:
     self._data: Final[Mapping[FrozenDictKeyType, FrozenDictValueType]] = copy.deepcopy(data)
   def __getitem__(self, key: FrozenDictKeyType) -> FrozenDictValueType:
+    val = self._data[key]
+    # Immutable values (e.g. enum members, strings, numbers, nested frozendicts) are returned as is,
+    # since a deep copy of them would be either the object itself or an equal immutable object.
+    # 不可变的值（枚举成员、字符串、数字、嵌套的 frozendict 等）直接返回，无需深拷贝。
+    if isinstance(val, _IMMUTABLE_VALUE_TYPES):
+      return val
     # Use deepcopy to avoid changing the original dict.
     # The value may not be deepcopyable though...
-    return copy.deepcopy(self._data[key])
+    return copy.deepcopy(val)
   def __iter__(self) -> Iterator[FrozenDictKeyType]:
     return iter(self._data)
   def __len__(self) -> int:
     return len(self._data)
 
+# Value types that `frozendict.__getitem__` hands out without copying.
+_IMMUTABLE_VALUE_TYPES: Final[tuple[type, ...]] = (Enum, str, int, float, bytes, type(None), frozendict)
+
 #endregion
 
 
@@ -165,13 +178,28 @@ class frozendict(Mapping[FrozenDictKeyType, FrozenDictValueType]):
 ######################################################
 #region Bazi
 
+# There are only 10 distinct traits, so their string forms are cached. 仅有 10 种五行阴阳组合，因此缓存其字符串。
+@functools.lru_cache(maxsize=10)
+def _trait_str(wuxing: Wuxing, yinyang: Yinyang) -> str:
+  return str(yinyang) + str(wuxing)
+
+
 class TraitTuple(NamedTuple):
   '''Representing the Wuxing and Yinyang of a Tiangan or Dizhi. 某天干或地支的五行和阴阳。'''
   wuxing:  Wuxing
   yinyang: Yinyang
 
   def __str__(self) -> str:
-    return str(self.yinyang) + str(self.wuxing)
+    return _trait_str(self.wuxing, self.yinyang)
+
+  # `TraitTuple` only holds enum members, so it is deeply immutable. Copies can safely be the object itself,
+  # which keeps the shared instances in the trait tables shared after `frozendict`'s deep copies.
+  # `TraitTuple` 只包含枚举成员，是完全不可变的，复制时直接返回自身即可。
+  def __copy__(self) -> 'TraitTuple':
+    return self
+
+  def __deepcopy__(self, memo: dict[int, Any]) -> 'TraitTuple':
+    return self
 
 
 class DayunTuple(NamedTuple):
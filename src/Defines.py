@@ -3,7 +3,7 @@
 import functools
 
 from enum import Enum
-from typing import NamedTuple
+from typing import NamedTuple, Final
 
 
 class Tiangan(Enum):
@@ -45,14 +45,23 @@ class Tiangan(Enum):
   
   @property
   def index(self) -> int:
-    return Tiangan.as_list().index(self)
+    return _TIANGAN_INDEX[self]
   
   @staticmethod
   def from_index(i: int) -> 'Tiangan':
-    return Tiangan.as_list()[i]
+    return _TIANGANS[i]
+
+  # Members are singletons and compared by identity, so hash by identity too.
+  # `Enum.__hash__` is implemented in Python, while `object.__hash__` is a C slot, which makes dict/set lookups faster.
+  # 成员均为单例且按身份比较，因此直接使用 `object.__hash__`，以加快字典/集合的查找。
+  __hash__ = object.__hash__
 
 天干 = Tiangan # Alias
 
+# Members in definition order and their positions, so that `index`/`from_index` are O(1). 按定义顺序排列的成员及其序号。
+_TIANGANS: Final[tuple[Tiangan, ...]] = tuple(Tiangan)
+_TIANGAN_INDEX: Final[dict[Tiangan, int]] = { tg : i for i, tg in enumerate(_TIANGANS) }
+
 
 class Dizhi(Enum):
   '''Dizhi / Branch / 地支'''
@@ -97,14 +106,23 @@ class Dizhi(Enum):
   
   @property
   def index(self) -> int:
-    return Dizhi.as_list().index(self)
+    return _DIZHI_INDEX[self]
   
   @staticmethod
   def from_index(i: int) -> 'Dizhi':
-    return Dizhi.as_list()[i]
+    return _DIZHIS[i]
+
+  # Members are singletons and compared by identity, so hash by identity too.
+  # `Enum.__hash__` is implemented in Python, while `object.__hash__` is a C slot, which makes dict/set lookups faster.
+  # 成员均为单例且按身份比较，因此直接使用 `object.__hash__`，以加快字典/集合的查找。
+  __hash__ = object.__hash__
 
 地支 = Dizhi  # Alias
 
+# Same as `_TIANGANS`/`_TIANGAN_INDEX`. 同上。
+_DIZHIS: Final[tuple[Dizhi, ...]] = tuple(Dizhi)
+_DIZHI_INDEX: Final[dict[Dizhi, int]] = { dz : i for i, dz in enumerate(_DIZHIS) }
+
 
 class Ganzhi(NamedTuple):
   '''Ganzhi / Stem-branch / 干支'''
@@ -124,18 +142,30 @@ class Ganzhi(NamedTuple):
     return f'{self.tiangan}{self.dizhi}'
   
   @staticmethod
-  def list_sexagenary_cycle() -> list['Ganzhi']:
+  @functools.cache
+  def sexagenary_cycle() -> tuple['Ganzhi', ...]:
     '''
-    Return a list of all 60 `Ganzhi` pairs in the sexagenary cycle.
-    列出所有 60 甲子中的所有天干地支组合。
+    Return all 60 `Ganzhi` pairs in the sexagenary cycle as a tuple.
+    The tuple is built only once and shared by all callers.
+    以元组形式返回 60 甲子中的所有天干地支组合。该元组只构造一次，被所有调用者共享。
 
-    Return: a list of `Ganzhi` tuples representing the 60 ganzhi pairs.
+    Return: a tuple of `Ganzhi` representing the 60 ganzhi pairs.
     '''
     tiangan_list: list[Tiangan] = Tiangan.as_list() * 6
     dizhi_list: list[Dizhi] = Dizhi.as_list() * 5
     assert len(tiangan_list) == len(dizhi_list)
     assert len(tiangan_list) == 60 # 60 甲子
-    return [Ganzhi(tg, dz) for tg, dz in zip(tiangan_list, dizhi_list)]
+    return tuple(Ganzhi(tg, dz) for tg, dz in zip(tiangan_list, dizhi_list))
+
+  @staticmethod
+  def list_sexagenary_cycle() -> list['Ganzhi']:
+    '''
+    Return a list of all 60 `Ganzhi` pairs in the sexagenary cycle.
+    列出所有 60 甲子中的所有天干地支组合。
+
+    Return: a list of `Ganzhi` tuples representing the 60 ganzhi pairs.
+    '''
+    return list(Ganzhi.sexagenary_cycle())
 
   @staticmethod
   def list_sexagenary_cycle_strs() -> list[str]:
@@ -145,18 +175,18 @@ class Ganzhi(NamedTuple):
 
     Return: a list of strings representing the 60 ganzhi pairs.
     '''
-    return [str(gz) for gz in Ganzhi.list_sexagenary_cycle()]
+    return [str(gz) for gz in Ganzhi.sexagenary_cycle()]
 
   @functools.lru_cache(maxsize=1024)
   def next(self, step: int = 1) -> 'Ganzhi':
     assert isinstance(step, int)
-    cycle: list[Ganzhi] = Ganzhi.list_sexagenary_cycle()
+    cycle: tuple[Ganzhi, ...] = Ganzhi.sexagenary_cycle()
     return cycle[(cycle.index(self) + step) % 60]
 
   @functools.lru_cache(maxsize=1024)
   def prev(self, step: int = 1) -> 'Ganzhi':
     assert isinstance(step, int)
-    cycle: list[Ganzhi] = Ganzhi.list_sexagenary_cycle()
+    cycle: tuple[Ganzhi, ...] = Ganzhi.sexagenary_cycle()
     return cycle[(cycle.index(self) - step) % 60]
 
 干支 = Ganzhi # Alias
@@ -256,6 +286,9 @@ class Wuxing(Enum):
   金 = METAL
   水 = WATER
 
+  # Hashed by identity, same as `Tiangan`. 同 `Tiangan`，按身份哈希。
+  __hash__ = object.__hash__
+
   @classmethod
   def from_str(cls, s: str) -> 'Wuxing':
     assert isinstance(s, str)
@@ -287,17 +320,9 @@ class Wuxing(Enum):
     - Wuxing.木.generates(Wuxing.火) -> True  # Wood feeds Fire / 木生火
     - Wuxing.火.generates(Wuxing.木) -> False # Fire does not generate Wood / 火不生木
     '''
-    if self is Wuxing.木:
-      return wx is Wuxing.火
-    elif self is Wuxing.火:
-      return wx is Wuxing.土
-    elif self is Wuxing.土:
-      return wx is Wuxing.金
-    elif self is Wuxing.金:
-      return wx is Wuxing.水
-    else:
-      assert self is Wuxing.水
-      return wx is Wuxing.木
+    # Members are defined in the generating order (木 -> 火 -> 土 -> 金 -> 水 -> 木).
+    # 成员按相生的顺序定义。
+    return (_WUXING_INDEX[wx] - _WUXING_INDEX[self]) % 5 == 1
     
   def destructs(self, wx: 'Wuxing') -> bool:
     '''
@@ -317,17 +342,11 @@ class Wuxing(Enum):
     - Wuxing.土.destructs(Wuxing.水) -> True  # Earth destroys Water / 土克水
     - Wuxing.水.destructs(Wuxing.土) -> False # Water does not destroy Earth / 水不克土
     '''
-    if self is Wuxing.木:
-      return wx is Wuxing.土
-    elif self is Wuxing.火:
-      return wx is Wuxing.金
-    elif self is Wuxing.土:
-      return wx is Wuxing.水
-    elif self is Wuxing.金:
-      return wx is Wuxing.木
-    else:
-      assert self is Wuxing.水
-      return wx is Wuxing.火
+    # Each Wuxing destroys the one two steps after it in the generating order. 五行克其后隔一位者。
+    return (_WUXING_INDEX[wx] - _WUXING_INDEX[self]) % 5 == 2
+
+# The ordinals of Wuxings, in the generating order. 五行的序号，按相生的顺序排列。
+_WUXING_INDEX: Final[dict[Wuxing, int]] = { wx : i for i, wx in enumerate(Wuxing) }
 
 五行 = Wuxing # Alias
 
@@ -475,16 +494,20 @@ class ShierZhangsheng(Enum):
   
   @property
   def index(self) -> int:
-    return ShierZhangsheng.as_list().index(self)
+    return _SHIER_ZHANGSHENG_INDEX[self]
   
   @classmethod
   def from_index(cls, index: int) -> 'ShierZhangsheng':
-    return ShierZhangsheng.as_list()[index]
+    return _SHIER_ZHANGSHENGS[index]
 
   def __str__(self) -> str:
     return str(self.value)
 
 十二长生 = ShierZhangsheng
+
+# Same as `_TIANGANS`/`_TIANGAN_INDEX`. 同上。
+_SHIER_ZHANGSHENGS: Final[tuple[ShierZhangsheng, ...]] = tuple(ShierZhangsheng)
+_SHIER_ZHANGSHENG_INDEX: Final[dict[ShierZhangsheng, int]] = { zs : i for i, zs in enumerate(_SHIER_ZHANGSHENGS) }
  
 
 class TianganRelation(Enum):
@@ -28,8 +28,8 @@ class Interpreter:
 
   def __init__(self, chart: BaziChart) -> None:
     '''
-    This method initializes a new instance of the Interpretation class by
-    creating a deep copy of the provided BaziChart object.
+    This method initializes a new instance of the Interpretation class.
+    The provided BaziChart object is read-only, so it is shared instead of being copied.
 
     Args:
     - chart: (BaziChart) The BaziChart object to be interpreted.
@@ -38,10 +38,10 @@ class Interpreter:
       AssertionError: If the provided chart is not an instance of BaziChart.
     '''
     assert isinstance(chart, BaziChart)
-    self._chart: Final[BaziChart] = copy.deepcopy(chart)
+    self._chart: Final[BaziChart] = chart
 
     # TODO: To be implemented.
 
   @property
   def chart(self) -> BaziChart:
-    return copy.deepcopy(self._chart)
+    return self._chart
@@ -1,8 +1,9 @@
 # Copyright (C) 2024 Ningqi Wang (0xf3cd) <https://github.com/0xf3cd>
 
-import itertools
+import sys
 import functools
 from enum import Enum
+from typing import TypeVar, Type, Final, cast
 
 from .Common import classproperty, frozendict, TraitTuple, HiddenTianganDict, Const, ConstMetaClass
 from .Defines import Tiangan, Dizhi, Ganzhi, Wuxing, Yinyang
@@ -12,6 +13,33 @@ from .Defines import Tiangan, Dizhi, Ganzhi, Wuxing, Yinyang
 # The classproperty tables are expected to be immutable - so no deep copy is needed.
 
 
+_SingletonType = TypeVar('_SingletonType')
+@functools.cache
+def _singleton(cls: Type[_SingletonType]) -> _SingletonType:
+  '''Create the only instance of a stateless table class. 为无状态的表格类创建唯一实例。'''
+  return object.__new__(cls)
+
+
+# The only 10 distinct traits (5 Wuxing x 2 Yinyang).
+# Tiangans and Dizhis with the same traits share one `TraitTuple` object in the trait tables.
+# 只存在 10 种不同的五行阴阳组合。五行阴阳相同的天干、地支在特征表中共用同一个 `TraitTuple` 对象。
+_TRAITS: Final[dict[tuple[Wuxing, Yinyang], TraitTuple]] = {
+  (wx, yy) : TraitTuple(wx, yy) for wx in Wuxing for yy in Yinyang
+}
+
+
+# The 30 Nayin strings in the order of the sexagenary cycle, built and interned only once.
+# Non-ASCII literals are not interned automatically, so `sys.intern` makes equal Nayin strings share one object.
+# 按六十甲子顺序排列的 30 个纳音，只构造一次并驻留。非 ASCII 字面量不会被自动驻留，因此使用 `sys.intern`。
+_NAYIN_STRS: Final[tuple[str, ...]] = tuple(sys.intern(nayin) for nayin in (
+  '海中金', '炉中火', '大林木', '路旁土', '剑锋金', '山头火', 
+  '涧下水', '城头土', '白蜡金', '杨柳木', '泉中水', '屋上土', 
+  '霹雳火', '松柏木', '长流水', '沙中金', '山下火', '平地木', 
+  '壁上土', '金箔金', '覆灯火', '天河水', '大驿土', '钗钏金', 
+  '桑柘木', '大溪水', '沙中土', '天上火', '石榴木', '大海水',
+))
+
+
 class BaziRules(Const):
   '''Rules for `Bazi` and `BaziChart`.'''
 
@@ -55,16 +83,16 @@ class BaziRules(Const):
   @functools.cache
   def TIANGAN_TRAITS(cls) -> frozendict[Tiangan, TraitTuple]:
     return frozendict({
-      Tiangan.甲 : TraitTuple(Wuxing.木, Yinyang.阳),
-      Tiangan.乙 : TraitTuple(Wuxing.木, Yinyang.阴),
-      Tiangan.丙 : TraitTuple(Wuxing.火, Yinyang.阳),
-      Tiangan.丁 : TraitTuple(Wuxing.火, Yinyang.阴),
-      Tiangan.戊 : TraitTuple(Wuxing.土, Yinyang.阳),
-      Tiangan.己 : TraitTuple(Wuxing.土, Yinyang.阴),
-      Tiangan.庚 : TraitTuple(Wuxing.金, Yinyang.阳),
-      Tiangan.辛 : TraitTuple(Wuxing.金, Yinyang.阴),
-      Tiangan.壬 : TraitTuple(Wuxing.水, Yinyang.阳),
-      Tiangan.癸 : TraitTuple(Wuxing.水, Yinyang.阴),
+      Tiangan.甲 : _TRAITS[Wuxing.木, Yinyang.阳],
+      Tiangan.乙 : _TRAITS[Wuxing.木, Yinyang.阴],
+      Tiangan.丙 : _TRAITS[Wuxing.火, Yinyang.阳],
+      Tiangan.丁 : _TRAITS[Wuxing.火, Yinyang.阴],
+      Tiangan.戊 : _TRAITS[Wuxing.土, Yinyang.阳],
+      Tiangan.己 : _TRAITS[Wuxing.土, Yinyang.阴],
+      Tiangan.庚 : _TRAITS[Wuxing.金, Yinyang.阳],
+      Tiangan.辛 : _TRAITS[Wuxing.金, Yinyang.阴],
+      Tiangan.壬 : _TRAITS[Wuxing.水, Yinyang.阳],
+      Tiangan.癸 : _TRAITS[Wuxing.水, Yinyang.阴],
     })
 
   # The table is used to query the Wuxing and Yinyang of a given Dizhi (i.e. Branch / 地支).
@@ -73,18 +101,18 @@ class BaziRules(Const):
   @functools.cache
   def DIZHI_TRAITS(cls) -> frozendict[Dizhi, TraitTuple]:
     return frozendict({
-      Dizhi.子 : TraitTuple(Wuxing.水, Yinyang.阳),
-      Dizhi.丑 : TraitTuple(Wuxing.土, Yinyang.阴),
-      Dizhi.寅 : TraitTuple(Wuxing.木, Yinyang.阳),
-      Dizhi.卯 : TraitTuple(Wuxing.木, Yinyang.阴),
-      Dizhi.辰 : TraitTuple(Wuxing.土, Yinyang.阳),
-      Dizhi.巳 : TraitTuple(Wuxing.火, Yinyang.阴),
-      Dizhi.午 : TraitTuple(Wuxing.火, Yinyang.阳),
-      Dizhi.未 : TraitTuple(Wuxing.土, Yinyang.阴),
-      Dizhi.申 : TraitTuple(Wuxing.金, Yinyang.阳),
-      Dizhi.酉 : TraitTuple(Wuxing.金, Yinyang.阴),
-      Dizhi.戌 : TraitTuple(Wuxing.土, Yinyang.阳),
-      Dizhi.亥 : TraitTuple(Wuxing.水, Yinyang.阴),
+      Dizhi.子 : _TRAITS[Wuxing.水, Yinyang.阳],
+      Dizhi.丑 : _TRAITS[Wuxing.土, Yinyang.阴],
+      Dizhi.寅 : _TRAITS[Wuxing.木, Yinyang.阳],
+      Dizhi.卯 : _TRAITS[Wuxing.木, Yinyang.阴],
+      Dizhi.辰 : _TRAITS[Wuxing.土, Yinyang.阳],
+      Dizhi.巳 : _TRAITS[Wuxing.火, Yinyang.阴],
+      Dizhi.午 : _TRAITS[Wuxing.火, Yinyang.阳],
+      Dizhi.未 : _TRAITS[Wuxing.土, Yinyang.阴],
+      Dizhi.申 : _TRAITS[Wuxing.金, Yinyang.阳],
+      Dizhi.酉 : _TRAITS[Wuxing.金, Yinyang.阴],
+      Dizhi.戌 : _TRAITS[Wuxing.土, Yinyang.阳],
+      Dizhi.亥 : _TRAITS[Wuxing.水, Yinyang.阴],
     })
 
   # The table is used to find the hidden Tiangans (i.e. Stems / 天干) and their percentages in the given Dizhi (Branch / 地支).
@@ -112,18 +140,9 @@ class BaziRules(Const):
   @classproperty
   @functools.cache
   def NAYIN(cls) -> frozendict[Ganzhi, str]:
-    NAYIN_STR_LIST: list[str] = [
-      '海中金', '炉中火', '大林木', '路旁土', '剑锋金', '山头火', 
-      '涧下水', '城头土', '白蜡金', '杨柳木', '泉中水', '屋上土', 
-      '霹雳火', '松柏木', '长流水', '沙中金', '山下火', '平地木', 
-      '壁上土', '金箔金', '覆灯火', '天河水', '大驿土', '钗钏金', 
-      '桑柘木', '大溪水', '沙中土', '天上火', '石榴木', '大海水',
-    ]
-    nayin_mapping_table: dict[Ganzhi, str] = {}
-    cycle = Ganzhi.list_sexagenary_cycle()
-    for index, gz in enumerate(cycle):
-      nayin_mapping_table[gz] = NAYIN_STR_LIST[index // 2]
-    return frozendict(nayin_mapping_table)
+    # Every two consecutive Ganzhis in the sexagenary cycle share one Nayin. 六十甲子中每相邻两柱共用一个纳音。
+    doubled: list[str] = [nayin for nayin in _NAYIN_STRS for _ in range(2)]
+    return frozendict(dict(zip(Ganzhi.sexagenary_cycle(), doubled)))
 
   # The table is used to query the dizhi where the Zhangsheng locates for each Tiangan.
   # 该字典用于查询每个天干的长生所在的地支。
@@ -204,14 +223,14 @@ class TianganRules(Const):
   @classproperty
   @functools.cache
   def TIANGAN_SHENG(cls) -> frozenset[tuple[Tiangan, Tiangan]]:
-    traits_rule = BaziRules.TIANGAN_TRAITS
-    ret: list[tuple[Tiangan, Tiangan]] = []
-    for tg1, tg2 in itertools.product(Tiangan, Tiangan):
-      tg1_trait: TraitTuple = traits_rule[tg1]
-      tg2_trait: TraitTuple = traits_rule[tg2]
-      if tg1_trait.wuxing.generates(tg2_trait.wuxing): # Yinyang not considered. 天干相生不考虑阴阳。
-        ret.append((tg1, tg2)) # Direction: tg1 -> tg2
-    return frozenset(ret)
+    # Direction: tg1 -> tg2. Derived from `TIANGAN_TRAITS` and `Wuxing`; tests check the consistency.
+    return frozenset((
+      (Tiangan.甲, Tiangan.丙), (Tiangan.甲, Tiangan.丁), (Tiangan.乙, Tiangan.丙), (Tiangan.乙, Tiangan.丁), # 木生火
+      (Tiangan.丙, Tiangan.戊), (Tiangan.丙, Tiangan.己), (Tiangan.丁, Tiangan.戊), (Tiangan.丁, Tiangan.己), # 火生土
+      (Tiangan.戊, Tiangan.庚), (Tiangan.戊, Tiangan.辛), (Tiangan.己, Tiangan.庚), (Tiangan.己, Tiangan.辛), # 土生金
+      (Tiangan.庚, Tiangan.壬), (Tiangan.庚, Tiangan.癸), (Tiangan.辛, Tiangan.壬), (Tiangan.辛, Tiangan.癸), # 金生水
+      (Tiangan.壬, Tiangan.甲), (Tiangan.壬, Tiangan.乙), (Tiangan.癸, Tiangan.甲), (Tiangan.癸, Tiangan.乙), # 水生木
+    ))
 
   # The table is used to query the KE (克) relation across all Tiangans.
   # KE relation is a uni-directional relation.
@@ -222,15 +241,25 @@ class TianganRules(Const):
   @classproperty
   @functools.cache
   def TIANGAN_KE(cls) -> frozenset[tuple[Tiangan, Tiangan]]:
-    traits_rule = BaziRules.TIANGAN_TRAITS
-    ret: list[tuple[Tiangan, Tiangan]] = []
-    for tg1, tg2 in itertools.product(Tiangan, Tiangan):
-      tg1_trait: TraitTuple = traits_rule[tg1]
-      tg2_trait: TraitTuple = traits_rule[tg2]
-      if tg1_trait.wuxing.destructs(tg2_trait.wuxing): # Yinyang not considered. 天干相克不考虑阴阳。
-        ret.append((tg1, tg2)) # Direction: tg1 -> tg2
-    return frozenset(ret)
+    # Direction: tg1 -> tg2. Derived from `TIANGAN_TRAITS` and `Wuxing`; tests check the consistency.
+    return frozenset((
+      (Tiangan.甲, Tiangan.戊), (Tiangan.甲, Tiangan.己), (Tiangan.乙, Tiangan.戊), (Tiangan.乙, Tiangan.己), # 木克土
+      (Tiangan.丙, Tiangan.庚), (Tiangan.丙, Tiangan.辛), (Tiangan.丁, Tiangan.庚), (Tiangan.丁, Tiangan.辛), # 火克金
+      (Tiangan.戊, Tiangan.壬), (Tiangan.戊, Tiangan.癸), (Tiangan.己, Tiangan.壬), (Tiangan.己, Tiangan.癸), # 土克水
+      (Tiangan.庚, Tiangan.甲), (Tiangan.庚, Tiangan.乙), (Tiangan.辛, Tiangan.甲), (Tiangan.辛, Tiangan.乙), # 金克木
+      (Tiangan.壬, Tiangan.丙), (Tiangan.壬, Tiangan.丁), (Tiangan.癸, Tiangan.丙), (Tiangan.癸, Tiangan.丁), # 水克火
+    ))
+
+
 
+# Dizhi pairs shared by the ANHE, TONGHE and TONGLUHE tables. Every pair is built only once and referenced by all tables.
+# 暗合、通合、通禄合表格共用的地支对。每一对只构造一次，被所有表格共同引用。
+_MAO_SHEN:  Final[frozenset[Dizhi]] = frozenset((Dizhi.卯, Dizhi.申))
+_SI_YOU:    Final[frozenset[Dizhi]] = frozenset((Dizhi.巳, Dizhi.酉))
+_HAI_WU:    Final[frozenset[Dizhi]] = frozenset((Dizhi.亥, Dizhi.午))
+_ZI_SI:     Final[frozenset[Dizhi]] = frozenset((Dizhi.子, Dizhi.巳))
+_YIN_WU:    Final[frozenset[Dizhi]] = frozenset((Dizhi.寅, Dizhi.午))
+_YIN_CHOU:  Final[frozenset[Dizhi]] = frozenset((Dizhi.寅, Dizhi.丑))
 
 
 class DizhiRules(Const):
@@ -278,47 +307,35 @@ class DizhiRules(Const):
     # Only add new definitions.
 
   class AnheTable(metaclass=ConstMetaClass):
+    # `AnheTable` is stateless, so all instantiations share one single object.
+    # AnheTable 无状态，所有实例化均返回同一个对象。
+    def __new__(cls) -> 'DizhiRules.AnheTable':
+      return cast('DizhiRules.AnheTable', _singleton(cls))
+
     @classproperty
     @functools.cache
     def normal(cls) -> frozenset[frozenset[Dizhi]]:
-      return frozenset([
-        frozenset((Dizhi.卯, Dizhi.申)),
-        frozenset((Dizhi.巳, Dizhi.酉)),
-        frozenset((Dizhi.亥, Dizhi.午)),
-        frozenset((Dizhi.子, Dizhi.巳)),
-        frozenset((Dizhi.寅, Dizhi.午)),
-      ])
+      return frozenset([_MAO_SHEN, _SI_YOU, _HAI_WU, _ZI_SI, _YIN_WU])
     
     @classproperty
     @functools.cache
     def normal_extended(cls) -> frozenset[frozenset[Dizhi]]:
-      return frozenset([
-        frozenset((Dizhi.卯, Dizhi.申)),
-        frozenset((Dizhi.巳, Dizhi.酉)),
-        frozenset((Dizhi.亥, Dizhi.午)),
-        frozenset((Dizhi.子, Dizhi.巳)),
-        frozenset((Dizhi.寅, Dizhi.午)),
-        frozenset((Dizhi.寅, Dizhi.丑)),
-      ])
+      return frozenset([_MAO_SHEN, _SI_YOU, _HAI_WU, _ZI_SI, _YIN_WU, _YIN_CHOU])
     
     @classproperty
     @functools.cache
     def mangpai(cls) -> frozenset[frozenset[Dizhi]]:
-      return frozenset([
-        frozenset((Dizhi.卯, Dizhi.申)),
-        frozenset((Dizhi.寅, Dizhi.丑)),
-        frozenset((Dizhi.午, Dizhi.亥)),
-      ])
+      return frozenset([_MAO_SHEN, _YIN_CHOU, _HAI_WU])
+
+    # The tables indexed by `AnheDef.value`. 以 `AnheDef.value` 为下标的各表格。
+    @classproperty
+    @functools.cache
+    def _by_def(cls) -> tuple[frozenset[frozenset[Dizhi]], ...]:
+      return (cls.normal, cls.normal_extended, cls.mangpai)
 
     def __getitem__(self, anhe_def: 'DizhiRules.AnheDef') -> frozenset[frozenset[Dizhi]]:
       assert isinstance(anhe_def, DizhiRules.AnheDef)
-      if anhe_def == DizhiRules.AnheDef.NORMAL:
-        return self.normal
-      elif anhe_def == DizhiRules.AnheDef.NORMAL_EXTENDED:
-        return self.normal_extended
-      else:
-        assert anhe_def == DizhiRules.AnheDef.MANGPAI
-        return self.mangpai
+      return self._by_def[anhe_def.value]
 
   # The tables are used to query the ANHE (暗合) relation across all Dizhis.
   # ANHE relation is a non-directional/mutual relation.
@@ -337,10 +354,7 @@ class DizhiRules(Const):
   @classproperty
   @functools.cache
   def DIZHI_TONGHE(cls) -> frozenset[frozenset[Dizhi]]:
-    return frozenset([
-      frozenset((Dizhi.寅, Dizhi.丑)),
-      frozenset((Dizhi.午, Dizhi.亥)),
-    ])
+    return frozenset([_YIN_CHOU, _HAI_WU])
 
   # The table is used to query the TONGLUHE (通禄合) relation across all Dizhis.
   # TONGLUHE relation is a non-directional/mutual relation.
@@ -349,13 +363,8 @@ class DizhiRules(Const):
   @classproperty
   @functools.cache
   def DIZHI_TONGLUHE(cls) -> frozenset[frozenset[Dizhi]]:
-    return frozenset([
-      frozenset((Dizhi.卯, Dizhi.申)),
-      frozenset((Dizhi.巳, Dizhi.酉)),
-      frozenset((Dizhi.亥, Dizhi.午)),
-      frozenset((Dizhi.子, Dizhi.巳)),
-      frozenset((Dizhi.寅, Dizhi.午)),
-    ])
+    # Same pairs as `AnheDef.NORMAL`. 与 `AnheDef.NORMAL` 的暗合组合相同。
+    return frozenset([_MAO_SHEN, _SI_YOU, _HAI_WU, _ZI_SI, _YIN_WU])
   
   # The table is used to query the SANHE (三合) relation across all Dizhis.
   # SANHE relation is a non-directional/mutual relation.
@@ -407,37 +416,62 @@ class DizhiRules(Const):
     自刑   = ZIXING
 
   class XingTable(metaclass=ConstMetaClass):
+    # `XingTable` is stateless, so all instantiations share one single object.
+    # XingTable 无状态，所有实例化均返回同一个对象。
+    def __new__(cls) -> 'DizhiRules.XingTable':
+      return cast('DizhiRules.XingTable', _singleton(cls))
+
     @classproperty
     @functools.cache
     def strict(cls) -> frozendict[tuple[Dizhi, ...], 'DizhiRules.XingSubType']:
-      d: dict[tuple[Dizhi, ...], DizhiRules.XingSubType] = {}
-      for dz_tuple in itertools.permutations((Dizhi.丑, Dizhi.未, Dizhi.戌)):
-        d[dz_tuple] = DizhiRules.XingSubType.三刑
-      for dz_tuple in itertools.permutations((Dizhi.寅, Dizhi.巳, Dizhi.申)):
-        d[dz_tuple] = DizhiRules.XingSubType.三刑
-      for dz_tuple in itertools.permutations((Dizhi.子, Dizhi.卯)):
-        d[dz_tuple] = DizhiRules.XingSubType.子卯刑
-      for dz in (Dizhi.午, Dizhi.辰, Dizhi.酉, Dizhi.亥):
-        d[(dz, dz)] = DizhiRules.XingSubType.自刑
-      return frozendict(d)
+      return frozendict({
+        # 三刑: 丑未戌
+        (Dizhi.丑, Dizhi.未, Dizhi.戌): DizhiRules.XingSubType.三刑,
+        (Dizhi.丑, Dizhi.戌, Dizhi.未): DizhiRules.XingSubType.三刑,
+        (Dizhi.未, Dizhi.丑, Dizhi.戌): DizhiRules.XingSubType.三刑,
+        (Dizhi.未, Dizhi.戌, Dizhi.丑): DizhiRules.XingSubType.三刑,
+        (Dizhi.戌, Dizhi.丑, Dizhi.未): DizhiRules.XingSubType.三刑,
+        (Dizhi.戌, Dizhi.未, Dizhi.丑): DizhiRules.XingSubType.三刑,
+        # 三刑: 寅巳申
+        (Dizhi.寅, Dizhi.巳, Dizhi.申): DizhiRules.XingSubType.三刑,
+        (Dizhi.寅, Dizhi.申, Dizhi.巳): DizhiRules.XingSubType.三刑,
+        (Dizhi.巳, Dizhi.寅, Dizhi.申): DizhiRules.XingSubType.三刑,
+        (Dizhi.巳, Dizhi.申, Dizhi.寅): DizhiRules.XingSubType.三刑,
+        (Dizhi.申, Dizhi.寅, Dizhi.巳): DizhiRules.XingSubType.三刑,
+        (Dizhi.申, Dizhi.巳, Dizhi.寅): DizhiRules.XingSubType.三刑,
+        # 子卯刑
+        (Dizhi.子, Dizhi.卯):          DizhiRules.XingSubType.子卯刑,
+        (Dizhi.卯, Dizhi.子):          DizhiRules.XingSubType.子卯刑,
+        # 自刑
+        (Dizhi.午, Dizhi.午):          DizhiRules.XingSubType.自刑,
+        (Dizhi.辰, Dizhi.辰):          DizhiRules.XingSubType.自刑,
+        (Dizhi.酉, Dizhi.酉):          DizhiRules.XingSubType.自刑,
+        (Dizhi.亥, Dizhi.亥):          DizhiRules.XingSubType.自刑,
+      })
     
     @classproperty
     @functools.cache
     def loose(cls) -> frozendict[tuple[Dizhi, ...], 'DizhiRules.XingSubType']:
-      d: dict[tuple[Dizhi, ...], DizhiRules.XingSubType] = dict(DizhiRules.XingTable.strict)
-      for dz_tuple in ((Dizhi.丑, Dizhi.戌), (Dizhi.戌, Dizhi.未), (Dizhi.未, Dizhi.丑)):
-        d[dz_tuple] = DizhiRules.XingSubType.三刑
-      for dz_tuple in ((Dizhi.寅, Dizhi.巳), (Dizhi.巳, Dizhi.申), (Dizhi.申, Dizhi.寅)):
-        d[dz_tuple] = DizhiRules.XingSubType.三刑
-      return frozendict(d)
+      return frozendict({
+        **DizhiRules.XingTable.strict,
+        # Pairs from the three-Dizhi 三刑 combos. / 三刑中的两两相刑。
+        (Dizhi.丑, Dizhi.戌):          DizhiRules.XingSubType.三刑,
+        (Dizhi.戌, Dizhi.未):          DizhiRules.XingSubType.三刑,
+        (Dizhi.未, Dizhi.丑):          DizhiRules.XingSubType.三刑,
+        (Dizhi.寅, Dizhi.巳):          DizhiRules.XingSubType.三刑,
+        (Dizhi.巳, Dizhi.申):          DizhiRules.XingSubType.三刑,
+        (Dizhi.申, Dizhi.寅):          DizhiRules.XingSubType.三刑,
+      })
+
+    # The tables indexed by `XingDef.value`. 以 `XingDef.value` 为下标的各表格。
+    @classproperty
+    @functools.cache
+    def _by_def(cls) -> tuple[frozendict[tuple[Dizhi, ...], 'DizhiRules.XingSubType'], ...]:
+      return (cls.strict, cls.loose)
 
     def __getitem__(self, xing_def: 'DizhiRules.XingDef') -> frozendict[tuple[Dizhi, ...], 'DizhiRules.XingSubType']:
       assert isinstance(xing_def, DizhiRules.XingDef)
-      if xing_def is DizhiRules.XingDef.STRICT:
-        return self.strict
-      else:
-        assert xing_def is DizhiRules.XingDef.LOOSE
-        return self.loose
+      return self._by_def[xing_def.value]
 
   # The table is used to query the XING (刑) relation across all Dizhis.
   # XING relation is a directional relation.
@@ -496,13 +530,16 @@ class DizhiRules(Const):
   @classproperty
   @functools.cache
   def DIZHI_SHENG(cls) -> frozenset[tuple[Dizhi, Dizhi]]:
-    dizhi_traits: frozendict[Dizhi, TraitTuple] = BaziRules.DIZHI_TRAITS
-    ret: list[tuple[Dizhi, Dizhi]] = []
-    for dz1, dz2 in itertools.permutations(Dizhi, 2):
-      trait1, trait2 = dizhi_traits[dz1], dizhi_traits[dz2]
-      if trait1.wuxing.generates(trait2.wuxing):
-        ret.append((dz1, dz2))
-    return frozenset(ret)
+    # Direction: dz1 -> dz2. Derived from `DIZHI_TRAITS` and `Wuxing`; tests check the consistency.
+    return frozenset((
+      (Dizhi.寅, Dizhi.巳), (Dizhi.寅, Dizhi.午), (Dizhi.卯, Dizhi.巳), (Dizhi.卯, Dizhi.午), # 木生火
+      (Dizhi.巳, Dizhi.丑), (Dizhi.巳, Dizhi.辰), (Dizhi.巳, Dizhi.未), (Dizhi.巳, Dizhi.戌), # 火生土
+      (Dizhi.午, Dizhi.丑), (Dizhi.午, Dizhi.辰), (Dizhi.午, Dizhi.未), (Dizhi.午, Dizhi.戌),
+      (Dizhi.丑, Dizhi.申), (Dizhi.丑, Dizhi.酉), (Dizhi.辰, Dizhi.申), (Dizhi.辰, Dizhi.酉), # 土生金
+      (Dizhi.未, Dizhi.申), (Dizhi.未, Dizhi.酉), (Dizhi.戌, Dizhi.申), (Dizhi.戌, Dizhi.酉),
+      (Dizhi.申, Dizhi.子), (Dizhi.申, Dizhi.亥), (Dizhi.酉, Dizhi.子), (Dizhi.酉, Dizhi.亥), # 金生水
+      (Dizhi.子, Dizhi.寅), (Dizhi.子, Dizhi.卯), (Dizhi.亥, Dizhi.寅), (Dizhi.亥, Dizhi.卯), # 水生木
+    ))
   
   # The table is used to query the KE (克) relation across all Dizhis.
   # KE relation is a uni-directional relation.
@@ -513,13 +550,16 @@ class DizhiRules(Const):
   @classproperty
   @functools.cache
   def DIZHI_KE(cls) -> frozenset[tuple[Dizhi, Dizhi]]:
-    dizhi_traits: frozendict[Dizhi, TraitTuple] = BaziRules.DIZHI_TRAITS
-    ret: list[tuple[Dizhi, Dizhi]] = []
-    for dz1, dz2 in itertools.permutations(Dizhi, 2):
-      trait1, trait2 = dizhi_traits[dz1], dizhi_traits[dz2]
-      if trait1.wuxing.destructs(trait2.wuxing):
-        ret.append((dz1, dz2))
-    return frozenset(ret)
+    # Direction: dz1 -> dz2. Derived from `DIZHI_TRAITS` and `Wuxing`; tests check the consistency.
+    return frozenset((
+      (Dizhi.寅, Dizhi.丑), (Dizhi.寅, Dizhi.辰), (Dizhi.寅, Dizhi.未), (Dizhi.寅, Dizhi.戌), # 木克土
+      (Dizhi.卯, Dizhi.丑), (Dizhi.卯, Dizhi.辰), (Dizhi.卯, Dizhi.未), (Dizhi.卯, Dizhi.戌),
+      (Dizhi.巳, Dizhi.申), (Dizhi.巳, Dizhi.酉), (Dizhi.午, Dizhi.申), (Dizhi.午, Dizhi.酉), # 火克金
+      (Dizhi.丑, Dizhi.子), (Dizhi.丑, Dizhi.亥), (Dizhi.辰, Dizhi.子), (Dizhi.辰, Dizhi.亥), # 土克水
+      (Dizhi.未, Dizhi.子), (Dizhi.未, Dizhi.亥), (Dizhi.戌, Dizhi.子), (Dizhi.戌, Dizhi.亥),
+      (Dizhi.申, Dizhi.寅), (Dizhi.申, Dizhi.卯), (Dizhi.酉, Dizhi.寅), (Dizhi.酉, Dizhi.卯), # 金克木
+      (Dizhi.子, Dizhi.巳), (Dizhi.子, Dizhi.午), (Dizhi.亥, Dizhi.巳), (Dizhi.亥, Dizhi.午), # 水克火
+    ))
 
 
 
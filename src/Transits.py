@@ -5,9 +5,8 @@ import random
 from enum import unique, IntFlag
 from typing import Final, Generator
 
-from .Common import DayunTuple, frozendict
+from .Common import DayunTuple
 from .Defines import Ganzhi
-from .Calendar import CalendarDate
 from .Utils.BaziUtils import ganzhi_of_year
 from .BaziChart import BaziChart
 
@@ -17,23 +16,24 @@ class DayunDatabase:
   def __init__(self, chart: BaziChart) -> None:
     self._gen: Final[Generator[DayunTuple, None, None]] = chart.dayun
     self._first_dayun: Final[DayunTuple] = next(self._gen)
-    self._cache: Final[dict[int, Ganzhi]] = {
-      self._first_dayun.ganzhi_year : self._first_dayun.ganzhi,
-    }
+    # Dayuns produced so far, in order. The i-th entry starts in `first_dayun.ganzhi_year + 10 * i`.
+    # 已生成的大运，按顺序排列。
+    self._dayuns: Final[list[DayunTuple]] = [self._first_dayun]
+
+  @property
+  def first_dayun(self) -> DayunTuple:
+    '''The first Dayun (大运) of the chart. 第一步大运。'''
+    return self._first_dayun
 
   def __getitem__(self, gz_year: int) -> DayunTuple:
     assert isinstance(gz_year, int)
     assert gz_year >= self._first_dayun.ganzhi_year
 
     dayun_idx: int = (gz_year - self._first_dayun.ganzhi_year) // 10
-    expected_gz_year: int = self._first_dayun.ganzhi_year + 10 * dayun_idx
-
-    while expected_gz_year not in self._cache:
-      next_dayun: DayunTuple = next(self._gen)
-      self._cache[next_dayun.ganzhi_year] = next_dayun.ganzhi
-
-    return DayunTuple(expected_gz_year, self._cache[expected_gz_year])
+    while len(self._dayuns) <= dayun_idx:
+      self._dayuns.append(next(self._gen))
 
+    return self._dayuns[dayun_idx]
 
 @unique
 class TransitOptions(IntFlag):
@@ -47,31 +47,55 @@ class TransitOptions(IntFlag):
   @staticmethod
   def random() -> 'TransitOptions':
     '''Mainly for testing purpose.'''
-    # Python 3.9 complains about the return type if using `random.choice(list(TransitOptions))`.
-    # So explicitly list all options here.
-    return random.choice([
-      TransitOptions.XIAOYUN,
-      TransitOptions.DAYUN,
-      TransitOptions.LIUNIAN,
-      TransitOptions.XIAOYUN_LIUNIAN,
-      TransitOptions.DAYUN_LIUNIAN,
-    ])
+    return random.choice(_ALL_OPTIONS)
+
+
+# Python 3.9 complains about the return type if using `random.choice(list(TransitOptions))`.
+# So explicitly list all options here.
+_ALL_OPTIONS: Final[tuple[TransitOptions, ...]] = (
+  TransitOptions.XIAOYUN,
+  TransitOptions.DAYUN,
+  TransitOptions.LIUNIAN,
+  TransitOptions.XIAOYUN_LIUNIAN,
+  TransitOptions.DAYUN_LIUNIAN,
+)
+
+# Integer forms of the flags, so that the hot paths below test plain ints. / 各选项的整数值。
+_XIAOYUN: Final[int] = TransitOptions.XIAOYUN.value
+_DAYUN:   Final[int] = TransitOptions.DAYUN.value
+_LIUNIAN: Final[int] = TransitOptions.LIUNIAN.value
+
+# The int values of all valid options. / 所有合法选项的整数值。
+_OPTION_VALUES: Final[frozenset[int]] = frozenset(option.value for option in _ALL_OPTIONS)
 
 
 class TransitDatabase:
   '''A database that figures out the Ganzhis of transits.'''
   def __init__(self, chart: BaziChart) -> None:
-    self._birth_ganzhi_date: CalendarDate = chart.bazi.ganzhi_date
-
     birth_gz_year: Final[int] = chart.bazi.ganzhi_date.year
-    self._xiaoyun_ganzhis: Final[frozendict[int, Ganzhi]] = frozendict({
+    # Only read internally, so a plain dict is enough. / 仅在内部读取，使用普通字典即可。
+    self._xiaoyun_ganzhis: Final[dict[int, Ganzhi]] = {
       birth_gz_year + age - 1 : gz
       for age, gz in chart.xiaoyun
-    })
+    }
 
-    self._first_dayun_start_gz_year: Final[int] = next(chart.dayun).ganzhi_year
     self._dayun_db: Final[DayunDatabase] = DayunDatabase(chart)
 
+    # The first supported ganzhi years of Dayun and Liunian. / 大运、流年所支持的最早干支年。
+    # Reuse the first Dayun from `DayunDatabase` rather than evaluating `chart.dayun` once more.
+    self._first_dayun_start_gz_year: Final[int] = self._dayun_db.first_dayun.ganzhi_year
+    self._birth_gz_year: Final[int] = birth_gz_year
+
+  def _support(self, gz_year: int, opt: int) -> bool:
+    '''`support` without the input checks. `opt` is the int value of a valid `TransitOptions`.'''
+    if opt & _XIAOYUN and gz_year not in self._xiaoyun_ganzhis:
+      return False
+    if opt & _DAYUN and gz_year < self._first_dayun_start_gz_year:
+      return False
+    if opt & _LIUNIAN and gz_year < self._birth_gz_year:
+      return False
+    return True
+
   def support(self, gz_year: int, options: TransitOptions) -> bool:
     '''
     Return whether the given `gz_year` and `option` are supported by this `TransitDatabase`.
@@ -84,20 +108,8 @@ class TransitDatabase:
     '''
 
     assert isinstance(gz_year, int)
-    assert isinstance(options, TransitOptions)
-    assert options in TransitOptions
-
-    if options.value & TransitOptions.XIAOYUN.value:
-      if gz_year not in self._xiaoyun_ganzhis:
-        return False
-    if options.value & TransitOptions.DAYUN.value:
-      if gz_year < self._first_dayun_start_gz_year:
-        return False
-    if options.value & TransitOptions.LIUNIAN.value:
-      if gz_year < self._birth_ganzhi_date.year:
-        return False
-
-    return True
+    assert isinstance(options, TransitOptions) and options.value in _OPTION_VALUES
+    return self._support(gz_year, options.value)
 
   def ganzhis(self, gz_year: int, options: TransitOptions) -> tuple[Ganzhi, ...]:
     '''
@@ -113,20 +125,21 @@ class TransitDatabase:
     '''
 
     assert isinstance(gz_year, int)
-    assert isinstance(options, TransitOptions) and options in TransitOptions
+    assert isinstance(options, TransitOptions) and options.value in _OPTION_VALUES
 
-    if not self.support(gz_year, options):
+    opt: Final[int] = options.value
+    if not self._support(gz_year, opt):
       raise ValueError(f'Inputs not supported. Year: {gz_year}, options: {options}')
 
+    # Only the transits selected by `options` are worked out, in the order of (xiaoyun, dayun, liunian).
+    # So e.g. a Liunian-only query never makes `DayunDatabase` generate Dayuns up to `gz_year`.
+    # 仅计算 `options` 选中的运，顺序为 (小运, 大运, 流年)。例如只查流年时，不会令 `DayunDatabase` 生成大运。
     transit_ganzhis: list[Ganzhi] = []
-    if options.value & TransitOptions.XIAOYUN.value:
-      assert gz_year in self._xiaoyun_ganzhis
+    if opt & _XIAOYUN:
       transit_ganzhis.append(self._xiaoyun_ganzhis[gz_year])
-    if options.value & TransitOptions.DAYUN.value:
-      assert gz_year >= self._first_dayun_start_gz_year
+    if opt & _DAYUN:
       transit_ganzhis.append(self._dayun_db[gz_year].ganzhi)
-    if options.value & TransitOptions.LIUNIAN.value:
-      assert gz_year >= self._birth_ganzhi_date.year
+    if opt & _LIUNIAN:
       transit_ganzhis.append(ganzhi_of_year(gz_year))
 
     return tuple(transit_ganzhis)
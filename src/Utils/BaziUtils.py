@@ -1,15 +1,83 @@
 # Copyright (C) 2024 Ningqi Wang (0xf3cd) <https://github.com/0xf3cd>
 
-import copy
+from array import array
 
-from datetime import date, datetime
-from typing import Union
+from datetime import date
+from typing import Union, Final, Sequence
 
 from ..Defines import Ganzhi, Tiangan, Dizhi, Shishen, Wuxing, Yinyang, ShierZhangsheng
-from ..Common import TraitTuple, HiddenTianganDict
+# The ordinal tables behind `Tiangan.index`/`Dizhi.index`, read directly on hot paths to skip the property call.
+# `Tiangan.index`/`Dizhi.index` 背后的序号表，在热点路径上直接读取以省去属性调用。
+from ..Defines import _TIANGANS, _DIZHIS, _TIANGAN_INDEX, _DIZHI_INDEX
+from ..Common import TraitTuple, HiddenTianganDict, frozendict
 from ..Rules import BaziRules
 
 
+# The `BaziRules` tables as tuples indexed by the Tiangan/Dizhi ordinal - a tuple index instead of a hash probe.
+# 以天干、地支序号为下标的 `BaziRules` 表格元组形式，用下标访问替代哈希查找。
+_TIANGAN_TRAITS: Final[tuple[TraitTuple, ...]] = tuple(BaziRules.TIANGAN_TRAITS[tg] for tg in _TIANGANS)
+_DIZHI_TRAITS: Final[tuple[TraitTuple, ...]] = tuple(BaziRules.DIZHI_TRAITS[dz] for dz in _DIZHIS)
+_TIANGAN_ZHANGSHENG: Final[tuple[int, ...]] = tuple(_DIZHI_INDEX[BaziRules.TIANGAN_ZHANGSHENG[tg]] for tg in _TIANGANS) # Dizhi ordinals.
+# Traits of both Tiangans and Dizhis in one table, so that `traits` needs no dispatch on the input type.
+# 天干和地支的五行阴阳合并为一张表，`traits` 无需按输入类型分派。
+_TRAITS: Final[dict[Union[Tiangan, Dizhi], TraitTuple]] = {
+  **dict(zip(_TIANGANS, _TIANGAN_TRAITS)),
+  **dict(zip(_DIZHIS, _DIZHI_TRAITS)),
+}
+_TIANGAN_LU: Final[tuple[Dizhi, ...]] = tuple(BaziRules.TIANGAN_LU[tg] for tg in _TIANGANS)
+assert all((tg.yinyang == dz.yinyang) == ((i ^ j) & 1 == 0) # `nayin_str` relies on this. `nayin_str` 依赖于此。
+           for i, tg in enumerate(_TIANGAN_TRAITS) for j, dz in enumerate(_DIZHI_TRAITS))
+
+# The sexagenary cycle, indexed by the Ganzhi ordinal. 以干支序号为下标的六十甲子。
+_SEXAGENARY_CYCLE: Final[tuple[Ganzhi, ...]] = Ganzhi.sexagenary_cycle()
+# Nayin keyed by Ganzhi, so that a Ganzhi outside of the cycle raises `KeyError` even when asserts are stripped.
+# 以干支为键的纳音表。不在六十甲子中的干支即使在去除断言后仍会抛出 `KeyError`。
+_NAYIN: Final[dict[Ganzhi, str]] = { gz : BaziRules.NAYIN[gz] for gz in _SEXAGENARY_CYCLE }
+_JIAZI_YEAR: Final[int] = 1984 # 1984 is the year of "甲子".
+_JIAZI_DAY_ORDINAL: Final[int] = date(2024, 3, 1).toordinal() # 2024-03-01 is a day of "甲子".
+
+# 年上起月表 and 日上起时表 expanded to every (year/day Tiangan, month/hour Dizhi) pair.
+# Both are flat 10x12 tuples indexed by `tg_idx * 12 + dz_idx`, so a lookup is one tuple index.
+# 展开后的年上起月表、日上起时表，覆盖所有（年干/日干，月支/时支）组合。二者均为以 `tg_idx * 12 + dz_idx` 为下标的 10x12 扁平元组。
+_MONTH_TIANGAN: Final[tuple[Tiangan, ...]] = tuple(
+  # The first month is "寅".
+  _TIANGANS[(_TIANGAN_INDEX[BaziRules.YEAR_TO_MONTH_TABLE[tg]] + (dz_idx - 2) % 12) % 10]
+  for tg in _TIANGANS for dz_idx in range(len(_DIZHIS))
+)
+_HOUR_TIANGAN: Final[tuple[Tiangan, ...]] = tuple(
+  _TIANGANS[(_TIANGAN_INDEX[BaziRules.DAY_TO_HOUR_TABLE[tg]] + dz_idx) % 10]
+  for tg in _TIANGANS for dz_idx in range(len(_DIZHIS))
+)
+
+# HIDDEN_TIANGANS as a tuple indexed by the Dizhi ordinal. Each entry is a tuple of (Tiangan, percentage) pairs.
+# Walking a small tuple is cheaper than copying and iterating a `HiddenTianganDict`.
+# 元组形式的藏干表，以地支序号为下标，每项为 (天干, 百分比) 组成的元组。遍历小元组比复制并遍历 `HiddenTianganDict` 更快。
+_HIDDEN_TIANGANS: Final[tuple[tuple[tuple[Tiangan, int], ...], ...]] = tuple(
+  tuple(BaziRules.HIDDEN_TIANGANS[dz].items()) for dz in _DIZHIS
+)
+
+# The main hidden Tiangan (主气) of every Dizhi, i.e. the one with the highest percentage, indexed by the Dizhi ordinal.
+# 以地支序号为下标的地支主气，即百分比最高的藏干。
+_MAIN_HIDDEN_TIANGANS: Final[tuple[Tiangan, ...]] = tuple(
+  max(hiddens, key=lambda pair: pair[1])[0] for hiddens in _HIDDEN_TIANGANS
+)
+
+# The `HiddenTianganDict`s themselves, indexed by the Dizhi ordinal.
+# They are immutable, so `hidden_tiangans` hands out the same object instead of a copy on every call.
+# 以地支序号为下标的 `HiddenTianganDict`。它们不可变，因此 `hidden_tiangans` 直接返回同一个对象而不是每次复制。
+_HIDDEN_TIANGAN_DICTS: Final[tuple[HiddenTianganDict, ...]] = tuple(BaziRules.HIDDEN_TIANGANS[dz] for dz in _DIZHIS)
+
+# Hidden Tiangan percentages as a flat 12x10 byte matrix: row = Dizhi ordinal, column = Tiangan ordinal.
+# 藏干百分比的 12x10 扁平字节矩阵：行为地支序号，列为天干序号。
+def _hidden_matrix() -> array:
+  matrix: array = array('B', bytes(len(_HIDDEN_TIANGANS) * len(_TIANGANS)))
+  for dz_idx, hiddens in enumerate(_HIDDEN_TIANGANS):
+    for tg, percentage in hiddens:
+      matrix[dz_idx * len(_TIANGANS) + _TIANGAN_INDEX[tg]] = percentage
+  return matrix
+
+_HIDDEN_MATRIX: Final[array] = _hidden_matrix()
+
 
 def ganzhi_of_day(dt: date) -> Ganzhi:
   '''
@@ -23,13 +91,34 @@ def ganzhi_of_day(dt: date) -> Ganzhi:
   '''
 
   assert isinstance(dt, date)
-  if isinstance(dt, datetime):
-    # `dt` is a datetime object. Convert it to a date object.
-    dt = date(dt.year, dt.month, dt.day)
+  # `toordinal` ignores the time part, so a datetime object needs no conversion.
+  return _SEXAGENARY_CYCLE[(dt.toordinal() - _JIAZI_DAY_ORDINAL) % 60]
+
+
+def ganzhi_of_days(start: date, end: date) -> tuple[Ganzhi, ...]:
+  '''
+  Return the Day Ganzhis of all dates from `start` to `end` (both inclusive), in order.
+  Equivalent to calling `ganzhi_of_day` on every date in the range, but without the per-date calls.
+  返回从 `start` 到 `end`（含两端）每一天的日柱。
 
-  jiazi_day_date: date = date(2024, 3, 1) # 2024-03-01 is a day of "甲子".
-  offset: int = (dt - jiazi_day_date).days
-  return Ganzhi(Tiangan.甲, Dizhi.子).next(offset)
+  Args:
+  - start: (date) The first date.
+  - end: (date) The last date. An empty tuple is returned if `end` is earlier than `start`.
+
+  Return: (tuple[Ganzhi, ...]) The Day Ganzhis (日柱) of the dates.
+
+  Examples:
+  - ganzhi_of_days(date(2024, 3, 1), date(2024, 3, 3))
+    - return: (Ganzhi(甲, 子), Ganzhi(乙, 丑), Ganzhi(丙, 寅))
+  '''
+
+  assert isinstance(start, date)
+  assert isinstance(end, date)
+
+  first_idx: int = (start.toordinal() - _JIAZI_DAY_ORDINAL) % 60
+  count: int = max(0, end.toordinal() - start.toordinal() + 1)
+  rotated: tuple[Ganzhi, ...] = _SEXAGENARY_CYCLE[first_idx:] + _SEXAGENARY_CYCLE[:first_idx]
+  return (rotated * (count // 60 + 1))[:count]
 
 
 def ganzhi_of_year(ganzhi_year: int) -> Ganzhi:
@@ -44,7 +133,7 @@ def ganzhi_of_year(ganzhi_year: int) -> Ganzhi:
   '''
 
   assert isinstance(ganzhi_year, int)
-  return Ganzhi(Tiangan.甲, Dizhi.子).next(ganzhi_year - 1984) # 1984 is the year of "甲子".
+  return _SEXAGENARY_CYCLE[(ganzhi_year - _JIAZI_YEAR) % 60]
 
 
 def month_tiangan(year_tiangan: Tiangan, month_dizhi: Dizhi) -> Tiangan:
@@ -62,10 +151,7 @@ def month_tiangan(year_tiangan: Tiangan, month_dizhi: Dizhi) -> Tiangan:
   assert isinstance(year_tiangan, Tiangan)
   assert isinstance(month_dizhi, Dizhi)
 
-  month_index: int = (month_dizhi.index - 2) % 12 # First month is "寅".
-  first_month_tiangan: Tiangan = BaziRules.YEAR_TO_MONTH_TABLE[year_tiangan]
-  month_tiangan_index: int = (first_month_tiangan.index + month_index) % 10
-  return Tiangan.from_index(month_tiangan_index)
+  return _MONTH_TIANGAN[_TIANGAN_INDEX[year_tiangan] * 12 + _DIZHI_INDEX[month_dizhi]]
 
 
 def hour_tiangan(day_tiangan: Tiangan, hour_dizhi: Dizhi) -> Tiangan:
@@ -83,10 +169,7 @@ def hour_tiangan(day_tiangan: Tiangan, hour_dizhi: Dizhi) -> Tiangan:
   assert isinstance(day_tiangan, Tiangan)
   assert isinstance(hour_dizhi, Dizhi)
 
-  hour_index: int = hour_dizhi.index
-  first_hour_tiangan: Tiangan = BaziRules.DAY_TO_HOUR_TABLE[day_tiangan]
-  hour_tiangan_index: int = (first_hour_tiangan.index + hour_index) % 10
-  return Tiangan.from_index(hour_tiangan_index)
+  return _HOUR_TIANGAN[_TIANGAN_INDEX[day_tiangan] * 12 + _DIZHI_INDEX[hour_dizhi]]
 
 
 def tiangan_traits(tg: Tiangan) -> TraitTuple:
@@ -101,7 +184,7 @@ def tiangan_traits(tg: Tiangan) -> TraitTuple:
   '''
 
   assert isinstance(tg, Tiangan)
-  return copy.deepcopy(BaziRules.TIANGAN_TRAITS[tg])
+  return _TIANGAN_TRAITS[_TIANGAN_INDEX[tg]]
 
 
 def dizhi_traits(dz: Dizhi) -> TraitTuple:
@@ -116,7 +199,7 @@ def dizhi_traits(dz: Dizhi) -> TraitTuple:
   '''
 
   assert isinstance(dz, Dizhi)
-  return copy.deepcopy(BaziRules.DIZHI_TRAITS[dz])
+  return _DIZHI_TRAITS[_DIZHI_INDEX[dz]]
 
 
 def traits(tg_or_dz: Union[Tiangan, Dizhi]) -> TraitTuple:
@@ -131,11 +214,7 @@ def traits(tg_or_dz: Union[Tiangan, Dizhi]) -> TraitTuple:
   '''
 
   assert isinstance(tg_or_dz, (Tiangan, Dizhi))
-  if isinstance(tg_or_dz, Tiangan):
-    return tiangan_traits(tg_or_dz)
-  else:
-    assert isinstance(tg_or_dz, Dizhi)
-    return dizhi_traits(tg_or_dz)
+  return _TRAITS[tg_or_dz]
 
 
 def hidden_tiangans(dz: Dizhi) -> HiddenTianganDict:
@@ -150,41 +229,40 @@ def hidden_tiangans(dz: Dizhi) -> HiddenTianganDict:
   '''
 
   assert isinstance(dz, Dizhi)
-  return copy.deepcopy(BaziRules.HIDDEN_TIANGANS[dz])
+  return _HIDDEN_TIANGAN_DICTS[_DIZHI_INDEX[dz]]
 
 
-def shishen(day_master: Tiangan, other: Union[Tiangan, Dizhi]) -> Shishen:
+def sum_hidden_tiangans(dizhis: Sequence[Dizhi]) -> frozendict[Tiangan, int]:
   '''
-  Get the Shishen of the given Tiangan.
-  输入日主和某天干或者地支，返回天干或地支对应的十神。
+  Sum up the percentages of hidden Tiangans across all the given Dizhis (e.g. the four Dizhis of a bazi chart).
+  输入多个地支（如八字的四个地支），返回其中所有藏干百分比之和。
 
   Args:
-  - day_master: (Tiangan) The Tiangan of the Day Master.
-  - other: (Union[Tiangan, Dizhi]) The Tiangan or Dizhi of the other.
+  - dizhis: (Sequence[Dizhi]) The Dizhis.
 
-  Return: (Shishen) The Shishen of the given Tiangan or Dizhi.
+  Return: (frozendict[Tiangan, int]) The total percentage of each hidden Tiangan. Tiangans not hidden in any given Dizhi are not included.
 
-  Example:
-  - shishen(Tiangan("甲"), Tiagan("甲")) -> Shishen("比肩") # "甲" is the "比肩" of "甲".
-  - shishen(Tiangan("甲"), Dizhi("寅")) -> Shishen("比肩")  # "寅" is the "比肩" of "甲".
-  - shishen(Tiangan("壬"), Dizhi("戌")) -> Shishen("七杀")  # "戌" is the "七杀" of "壬".
+  Examples:
+  - sum_hidden_tiangans([Dizhi.子, Dizhi.丑])
+    - return: frozendict({ Tiangan.己 : 60, Tiangan.辛 : 10, Tiangan.癸 : 130 })
   '''
 
-  assert isinstance(day_master, Tiangan)
-  assert isinstance(other, (Tiangan, Dizhi))
+  assert isinstance(dizhis, Sequence), 'Non-sequence input (e.g. an iterator) would be used up by the checks below.'
+  assert all(isinstance(dz, Dizhi) for dz in dizhis)
+
+  tg_count: int = len(_TIANGANS)
+  totals: list[int] = [0] * tg_count
+  for dz in dizhis:
+    row: int = _DIZHI_INDEX[dz] * tg_count
+    for tg_idx in range(tg_count):
+      totals[tg_idx] += _HIDDEN_MATRIX[row + tg_idx]
+  return frozendict({ tg : total for tg, total in zip(_TIANGANS, totals) if total > 0 })
 
-  def __find_tg() -> Tiangan:
-    if isinstance(other, Tiangan):
-      return other
-    else:
-      hiddens: HiddenTianganDict = hidden_tiangans(other)
-      # Find out the key of the hidden tiangan with the highest percentage (即寻找地支中的主气).
-      return max(hiddens.items(), key=lambda pair: pair[1])[0]
-  
-  other_tg: Tiangan = __find_tg()
 
-  day_master_traits: TraitTuple = tiangan_traits(day_master)
-  other_traits: TraitTuple = tiangan_traits(other_tg)
+def _calc_shishen(day_master: Tiangan, other_tg: Tiangan) -> Shishen:
+  '''Work out the Shishen of `other_tg` for `day_master`. Only used to build `_SHISHEN_TABLE`.'''
+  day_master_traits: TraitTuple = _TIANGAN_TRAITS[_TIANGAN_INDEX[day_master]]
+  other_traits: TraitTuple = _TIANGAN_TRAITS[_TIANGAN_INDEX[other_tg]]
 
   homogeneous: bool = day_master_traits.yinyang == other_traits.yinyang # Whether the two Tiangans are of the same Yinyang type.
   day_master_wuxing: Wuxing = day_master_traits.wuxing # The Wuxing of the Day Master.
@@ -217,6 +295,39 @@ def shishen(day_master: Tiangan, other: Union[Tiangan, Dizhi]) -> Shishen:
     else:
       return Shishen.from_str('官')
 
+# The Shishen of every (day master, Tiangan) and (day master, Dizhi) pair - 10 x (10 + 12) entries.
+# A Dizhi takes the Shishen of its main hidden Tiangan (主气).
+# 日主与每个天干、地支组合对应的十神，共 10 x (10 + 12) 项。地支取其主气对应的十神。
+_SHISHEN_TABLE: Final[dict[tuple[Tiangan, Union[Tiangan, Dizhi]], Shishen]] = {
+  **{ (dm, tg) : _calc_shishen(dm, tg) for dm in _TIANGANS for tg in _TIANGANS },
+  **{
+    (dm, dz) : _calc_shishen(dm, _MAIN_HIDDEN_TIANGANS[dz_idx])
+    for dm in _TIANGANS for dz_idx, dz in enumerate(_DIZHIS)
+  },
+}
+
+
+def shishen(day_master: Tiangan, other: Union[Tiangan, Dizhi]) -> Shishen:
+  '''
+  Get the Shishen of the given Tiangan.
+  输入日主和某天干或者地支，返回天干或地支对应的十神。
+
+  Args:
+  - day_master: (Tiangan) The Tiangan of the Day Master.
+  - other: (Union[Tiangan, Dizhi]) The Tiangan or Dizhi of the other.
+
+  Return: (Shishen) The Shishen of the given Tiangan or Dizhi.
+
+  Example:
+  - shishen(Tiangan("甲"), Tiagan("甲")) -> Shishen("比肩") # "甲" is the "比肩" of "甲".
+  - shishen(Tiangan("甲"), Dizhi("寅")) -> Shishen("比肩")  # "寅" is the "比肩" of "甲".
+  - shishen(Tiangan("壬"), Dizhi("戌")) -> Shishen("七杀")  # "戌" is the "七杀" of "壬".
+  '''
+
+  assert isinstance(day_master, Tiangan)
+  assert isinstance(other, (Tiangan, Dizhi))
+  return _SHISHEN_TABLE[day_master, other]
+
 
 def nayin_str(gz: Ganzhi) -> str:
   '''
@@ -234,11 +345,33 @@ def nayin_str(gz: Ganzhi) -> str:
 
   assert isinstance(gz, Ganzhi)
   
-  tg, dz = gz
-  tg_traits, dz_traits = traits(tg), traits(dz)
-  assert tg_traits.yinyang == dz_traits.yinyang # The yinyang of Tiangan and Dizhi should be the same.
+  # The yinyang of Tiangan and Dizhi should be the same. Both alternate YANG/YIN from index 0, so comparing the parities of the indices is enough.
+  # 天干与地支的阴阳应当相同。二者均从序号 0 起阳阴交替，因此只需比较序号的奇偶性。
+  assert (_TIANGAN_INDEX[gz.tiangan] ^ _DIZHI_INDEX[gz.dizhi]) & 1 == 0
+
+  return _NAYIN[gz]
+
 
-  return BaziRules.NAYIN[gz]
+def _calc_shier_zhangsheng(tg: Tiangan, dz: Dizhi) -> ShierZhangsheng:
+  '''Work out the ShierZhangsheng of `tg` at `dz`. Only used to build `_SHIER_ZHANGSHENG_TABLE`.'''
+  tg_idx: int = _TIANGAN_INDEX[tg]
+  tg_yinyang: Yinyang = _TIANGAN_TRAITS[tg_idx].yinyang
+  zhangsheng_place_idx: int = _TIANGAN_ZHANGSHENG[tg_idx]
+
+  offset: int = _DIZHI_INDEX[dz] - zhangsheng_place_idx
+  if tg_yinyang is Yinyang.YIN:
+    offset = zhangsheng_place_idx - _DIZHI_INDEX[dz]
+
+  return ShierZhangsheng.from_index(offset % 12)
+
+# The ShierZhangsheng of every (Tiangan, Dizhi) pair, and the reverse table of it - 10 x 12 entries each.
+# 每个（天干，地支）组合对应的十二长生，以及其反查表，各 10 x 12 项。
+_SHIER_ZHANGSHENG_TABLE: Final[dict[tuple[Tiangan, Dizhi], ShierZhangsheng]] = {
+  (tg, dz) : _calc_shier_zhangsheng(tg, dz) for tg in _TIANGANS for dz in _DIZHIS
+}
+_FROM_12ZHANGSHENG_TABLE: Final[dict[tuple[Tiangan, ShierZhangsheng], Dizhi]] = {
+  (tg, place) : dz for (tg, dz), place in _SHIER_ZHANGSHENG_TABLE.items()
+}
 
 
 def shier_zhangsheng(tg: Tiangan, dz: Dizhi) -> ShierZhangsheng:
@@ -260,15 +393,7 @@ def shier_zhangsheng(tg: Tiangan, dz: Dizhi) -> ShierZhangsheng:
   
   assert isinstance(tg, Tiangan)
   assert isinstance(dz, Dizhi)
-
-  tg_yinyang: Yinyang = traits(tg).yinyang
-  zhangsheng_place: Dizhi = BaziRules.TIANGAN_ZHANGSHENG[tg]
-
-  offset: int = dz.index - zhangsheng_place.index
-  if tg_yinyang is Yinyang.YIN:
-    offset = zhangsheng_place.index - dz.index
-
-  return ShierZhangsheng.from_index(offset % 12)
+  return _SHIER_ZHANGSHENG_TABLE[tg, dz]
 
 
 def from_12zhangsheng(tg: Tiangan, place: ShierZhangsheng) -> Dizhi:
@@ -293,11 +418,7 @@ def from_12zhangsheng(tg: Tiangan, place: ShierZhangsheng) -> Dizhi:
 
   assert isinstance(tg, Tiangan)
   assert isinstance(place, ShierZhangsheng)
-
-  tg_yinyang: Yinyang = traits(tg).yinyang
-  zhangsheng_dizhi: Dizhi = BaziRules.TIANGAN_ZHANGSHENG[tg]
-  offset: int = place.index if tg_yinyang is Yinyang.YANG else -place.index
-  return Dizhi.from_index((zhangsheng_dizhi.index + offset) % 12)
+  return _FROM_12ZHANGSHENG_TABLE[tg, place]
 
 
 def lu(tg: Tiangan) -> Dizhi:
@@ -315,4 +436,4 @@ def lu(tg: Tiangan) -> Dizhi:
   '''
 
   assert isinstance(tg, Tiangan)
-  return BaziRules.TIANGAN_LU[tg]
+  return _TIANGAN_LU[_TIANGAN_INDEX[tg]]
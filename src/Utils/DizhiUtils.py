@@ -1,11 +1,11 @@
 # Copyright (C) 2024 Ningqi Wang (0xf3cd) <https://github.com/0xf3cd>
 
 
-from collections import Counter
-from typing import Sequence, Optional, Final, Callable
+from typing import Sequence, Optional, Final, Callable, Iterable
 
 from ..Common import frozendict
 from ..Defines import Dizhi, Wuxing, DizhiRelation
+from ..Defines import _DIZHI_INDEX # The ordinal table behind `Dizhi.index`. `Dizhi.index` 背后的序号表。
 from ..Rules import DizhiRules
 
 
@@ -54,6 +54,86 @@ class DizhiRelationDiscovery(frozendict[DizhiRelation, DizhiRelationCombos]):
 DizhiRelationDiscoveryFilter = Callable[[DizhiRelation, DizhiCombo], bool]
 
 
+# Each Dizhi is encoded as one bit, so that a group of Dizhis (order and duplicates ignored) is an `int` bitmask.
+# Non-directional relations are then looked up by the bitmask, without building a tuple or frozenset per query.
+# A combo is contained in the input Dizhis iff `input_mask & combo_mask == combo_mask`.
+# 每个地支对应一个比特位，这样一组地支（不计顺序和重复）可以表示为一个整数位掩码。
+# 无方向的关系可以直接用位掩码查询，无需每次构造元组或 frozenset。
+# 当且仅当 `input_mask & combo_mask == combo_mask` 时，输入地支包含该组合。
+_DIZHI_BIT: Final[dict[Dizhi, int]] = { dz : 1 << idx for dz, idx in _DIZHI_INDEX.items() }
+
+def _mask(dizhis: Iterable[Dizhi]) -> int:
+  mask: int = 0
+  for dz in dizhis:
+    mask |= _DIZHI_BIT[dz]
+  return mask
+
+def _masks(combos: Iterable[DizhiCombo]) -> frozenset[int]:
+  return frozenset(_mask(combo) for combo in combos)
+
+_SANHUI_BY_MASK: Final[dict[int, Wuxing]] = { _mask(combo) : wx for combo, wx in DizhiRules.DIZHI_SANHUI.items() }
+_SANHE_BY_MASK: Final[dict[int, Wuxing]] = { _mask(combo) : wx for combo, wx in DizhiRules.DIZHI_SANHE.items() }
+_LIUHE_BY_MASK: Final[dict[int, Wuxing]] = { _mask(combo) : wx for combo, wx in DizhiRules.DIZHI_LIUHE.items() }
+_BANHE_BY_MASK: Final[dict[int, Wuxing]] = { _mask(combo) : wx for combo, wx in DizhiRules.DIZHI_BANHE.items() }
+_ANHE_MASKS: Final[dict[DizhiRules.AnheDef, frozenset[int]]] = {
+  anhe_def : _masks(DizhiRules.DIZHI_ANHE[anhe_def]) for anhe_def in DizhiRules.AnheDef
+}
+_TONGHE_MASKS: Final[frozenset[int]] = _masks(DizhiRules.DIZHI_TONGHE)
+_TONGLUHE_MASKS: Final[frozenset[int]] = _masks(DizhiRules.DIZHI_TONGLUHE)
+_CHONG_MASKS: Final[frozenset[int]] = _masks(DizhiRules.DIZHI_CHONG)
+_PO_MASKS: Final[frozenset[int]] = _masks(DizhiRules.DIZHI_PO)
+_HAI_MASKS: Final[frozenset[int]] = _masks(DizhiRules.DIZHI_HAI)
+
+# Directional pair relations are stored as flat 12x12 `bytes` matrices, indexed by `index(dz1) * 12 + index(dz2)`.
+# 有方向的两两关系存储为 12x12 的扁平 `bytes` 矩阵，下标为 `index(dz1) * 12 + index(dz2)`。
+_DIZHI_COUNT: Final[int] = len(_DIZHI_INDEX)
+
+def _matrix(pairs: frozenset[tuple[Dizhi, Dizhi]]) -> bytes:
+  m: bytearray = bytearray(_DIZHI_COUNT * _DIZHI_COUNT)
+  for dz1, dz2 in pairs:
+    m[_DIZHI_INDEX[dz1] * _DIZHI_COUNT + _DIZHI_INDEX[dz2]] = 1
+  return bytes(m)
+
+_SHENG_MATRIX: Final[bytes] = _matrix(DizhiRules.DIZHI_SHENG)
+_KE_MATRIX: Final[bytes] = _matrix(DizhiRules.DIZHI_KE)
+
+
+# For `search`, the combos of each relation are paired with their bitmasks.
+# `search` 中，每种关系的组合与其位掩码一一配对。
+def _masked(combos: Iterable[DizhiCombo]) -> tuple[tuple[DizhiCombo, int], ...]:
+  '''Pair every combo with its bitmask, keeping the order of the rule table.'''
+  return tuple((combo, _mask(combo)) for combo in combos)
+
+_MASKED_COMBOS: Final[dict[DizhiRelation, tuple[tuple[DizhiCombo, int], ...]]] = {
+  DizhiRelation.三会   : _masked(DizhiRules.DIZHI_SANHUI),
+  DizhiRelation.三合   : _masked(DizhiRules.DIZHI_SANHE),
+  DizhiRelation.六合   : _masked(DizhiRules.DIZHI_LIUHE),
+  DizhiRelation.暗合   : _masked(DizhiRules.DIZHI_ANHE[DizhiRules.AnheDef.NORMAL_EXTENDED]), # Use `NORMAL_EXTENDED` here, which has the widest definition.
+  DizhiRelation.通合   : _masked(DizhiRules.DIZHI_TONGHE),
+  DizhiRelation.通禄合 : _masked(DizhiRules.DIZHI_TONGLUHE),
+  DizhiRelation.半合   : _masked(DizhiRules.DIZHI_BANHE),
+  DizhiRelation.冲     : _masked(DizhiRules.DIZHI_CHONG),
+  DizhiRelation.破     : _masked(DizhiRules.DIZHI_PO),
+  DizhiRelation.害     : _masked(DizhiRules.DIZHI_HAI),
+  # SHENG/KE are directional, but `search` ignores directions, so each pair is kept once as an unordered combo.
+  DizhiRelation.生     : _masked(frozenset(map(DizhiCombo, DizhiRules.DIZHI_SHENG))),
+  DizhiRelation.克     : _masked(frozenset(map(DizhiCombo, DizhiRules.DIZHI_KE))),
+}
+
+# XING combos for `search`, each as `(combo, mask, duplicate_mask)`. `duplicate_mask` holds the Dizhis that must appear twice (自刑).
+# Permutations of the same Dizhis collapse into one entry.
+# `search` 所用的刑组合，每项为 `(组合, 掩码, 重复掩码)`。重复掩码中的地支需要出现两次（自刑）。同一组地支的不同排列只保留一项。
+def _masked_xing() -> tuple[tuple[DizhiCombo, int, int], ...]:
+  ret: dict[tuple[int, int], DizhiCombo] = {}
+  for xing_tuple in DizhiRules.DIZHI_XING[DizhiRules.XingDef.LOOSE]:
+    assert all(xing_tuple.count(dz) <= 2 for dz in xing_tuple)
+    dup_mask: int = _mask(dz for dz in xing_tuple if xing_tuple.count(dz) == 2)
+    ret.setdefault((_mask(xing_tuple), dup_mask), DizhiCombo(xing_tuple))
+  return tuple((combo, mask, dup_mask) for (mask, dup_mask), combo in ret.items())
+
+_MASKED_XING: Final[tuple[tuple[DizhiCombo, int, int], ...]] = _masked_xing()
+
+
 def sanhui(dz1: Dizhi, dz2: Dizhi, dz3: Dizhi) -> Optional[Wuxing]:
   '''
   Check if the input Dizhis are in SANHUI (三会) relation. If so, return the corresponding Wuxing. If not, return `None`.
@@ -76,8 +156,7 @@ def sanhui(dz1: Dizhi, dz2: Dizhi, dz3: Dizhi) -> Optional[Wuxing]:
   '''
 
   assert all(isinstance(dz, Dizhi) for dz in (dz1, dz2, dz3))
-  combo: DizhiCombo = DizhiCombo((dz1, dz2, dz3))
-  return DizhiRules.DIZHI_SANHUI.get(combo, None)
+  return _SANHUI_BY_MASK.get(_DIZHI_BIT[dz1] | _DIZHI_BIT[dz2] | _DIZHI_BIT[dz3])
 
 
 def liuhe(dz1: Dizhi, dz2: Dizhi) -> Optional[Wuxing]:
@@ -101,8 +180,7 @@ def liuhe(dz1: Dizhi, dz2: Dizhi) -> Optional[Wuxing]:
   '''
 
   assert all(isinstance(dz, Dizhi) for dz in (dz1, dz2))
-  combo: DizhiCombo = DizhiCombo((dz1, dz2))
-  return DizhiRules.DIZHI_LIUHE.get(combo, None)
+  return _LIUHE_BY_MASK.get(_DIZHI_BIT[dz1] | _DIZHI_BIT[dz2])
 
 
 def anhe(dz1: Dizhi, dz2: Dizhi, *, definition: DizhiRules.AnheDef = DizhiRules.AnheDef.NORMAL_EXTENDED) -> bool:
@@ -132,8 +210,7 @@ def anhe(dz1: Dizhi, dz2: Dizhi, *, definition: DizhiRules.AnheDef = DizhiRules.
 
   assert all(isinstance(dz, Dizhi) for dz in (dz1, dz2))
   assert isinstance(definition, DizhiRules.AnheDef)
-  combo: DizhiCombo = DizhiCombo((dz1, dz2))
-  return combo in DizhiRules.DIZHI_ANHE[definition]
+  return (_DIZHI_BIT[dz1] | _DIZHI_BIT[dz2]) in _ANHE_MASKS[definition]
 
 
 def tonghe(dz1: Dizhi, dz2: Dizhi) -> bool:
@@ -156,8 +233,7 @@ def tonghe(dz1: Dizhi, dz2: Dizhi) -> bool:
   '''
 
   assert all(isinstance(dz, Dizhi) for dz in (dz1, dz2))
-  combo: DizhiCombo = DizhiCombo((dz1, dz2))
-  return combo in DizhiRules.DIZHI_TONGHE
+  return (_DIZHI_BIT[dz1] | _DIZHI_BIT[dz2]) in _TONGHE_MASKS
 
 
 def tongluhe(dz1: Dizhi, dz2: Dizhi) -> bool:
@@ -180,8 +256,7 @@ def tongluhe(dz1: Dizhi, dz2: Dizhi) -> bool:
   '''
 
   assert all(isinstance(dz, Dizhi) for dz in (dz1, dz2))
-  combo: DizhiCombo = DizhiCombo((dz1, dz2))
-  return combo in DizhiRules.DIZHI_TONGLUHE
+  return (_DIZHI_BIT[dz1] | _DIZHI_BIT[dz2]) in _TONGLUHE_MASKS
 
 
 def sanhe(dz1: Dizhi, dz2: Dizhi, dz3: Dizhi) -> Optional[Wuxing]:
@@ -204,8 +279,7 @@ def sanhe(dz1: Dizhi, dz2: Dizhi, dz3: Dizhi) -> Optional[Wuxing]:
   '''
 
   assert all(isinstance(dz, Dizhi) for dz in (dz1, dz2, dz3))
-  combo: DizhiCombo = DizhiCombo((dz1, dz2, dz3))
-  return DizhiRules.DIZHI_SANHE.get(combo, None)
+  return _SANHE_BY_MASK.get(_DIZHI_BIT[dz1] | _DIZHI_BIT[dz2] | _DIZHI_BIT[dz3])
 
 
 def banhe(dz1: Dizhi, dz2: Dizhi) -> Optional[Wuxing]:
@@ -229,8 +303,7 @@ def banhe(dz1: Dizhi, dz2: Dizhi) -> Optional[Wuxing]:
   '''
 
   assert all(isinstance(dz, Dizhi) for dz in (dz1, dz2))
-  combo: DizhiCombo = DizhiCombo((dz1, dz2))
-  return DizhiRules.DIZHI_BANHE.get(combo, None)
+  return _BANHE_BY_MASK.get(_DIZHI_BIT[dz1] | _DIZHI_BIT[dz2])
 
 
 def xing(*dizhis: Dizhi, definition: DizhiRules.XingDef = DizhiRules.XingDef.LOOSE) -> Optional[DizhiRules.XingSubType]:
@@ -303,7 +376,7 @@ def chong(dz1: Dizhi, dz2: Dizhi) -> bool:
   '''
 
   assert all(isinstance(dz, Dizhi) for dz in (dz1, dz2))
-  return DizhiCombo((dz1, dz2)) in DizhiRules.DIZHI_CHONG
+  return (_DIZHI_BIT[dz1] | _DIZHI_BIT[dz2]) in _CHONG_MASKS
 
 
 def po(dz1: Dizhi, dz2: Dizhi) -> bool:
@@ -329,7 +402,7 @@ def po(dz1: Dizhi, dz2: Dizhi) -> bool:
   '''
 
   assert all(isinstance(dz, Dizhi) for dz in (dz1, dz2))
-  return DizhiCombo((dz1, dz2)) in DizhiRules.DIZHI_PO
+  return (_DIZHI_BIT[dz1] | _DIZHI_BIT[dz2]) in _PO_MASKS
 
 
 def hai(dz1: Dizhi, dz2: Dizhi) -> bool:
@@ -355,7 +428,7 @@ def hai(dz1: Dizhi, dz2: Dizhi) -> bool:
   '''
 
   assert all(isinstance(dz, Dizhi) for dz in (dz1, dz2))
-  return DizhiCombo((dz1, dz2)) in DizhiRules.DIZHI_HAI
+  return (_DIZHI_BIT[dz1] | _DIZHI_BIT[dz2]) in _HAI_MASKS
 
 
 def sheng(dz1: Dizhi, dz2: Dizhi) -> bool:
@@ -385,7 +458,7 @@ def sheng(dz1: Dizhi, dz2: Dizhi) -> bool:
   '''
 
   assert all(isinstance(dz, Dizhi) for dz in (dz1, dz2))
-  return (dz1, dz2) in DizhiRules.DIZHI_SHENG
+  return _SHENG_MATRIX[_DIZHI_INDEX[dz1] * _DIZHI_COUNT + _DIZHI_INDEX[dz2]] == 1
 
 
 def ke(dz1: Dizhi, dz2: Dizhi) -> bool:
@@ -415,7 +488,7 @@ def ke(dz1: Dizhi, dz2: Dizhi) -> bool:
   '''
 
   assert all(isinstance(dz, Dizhi) for dz in (dz1, dz2))
-  return (dz1, dz2) in DizhiRules.DIZHI_KE
+  return _KE_MATRIX[_DIZHI_INDEX[dz1] * _DIZHI_COUNT + _DIZHI_INDEX[dz2]] == 1
 
 
 def search(dizhis: Sequence[Dizhi], relation: DizhiRelation) -> DizhiRelationCombos:
@@ -482,57 +555,32 @@ def search(dizhis: Sequence[Dizhi], relation: DizhiRelation) -> DizhiRelationCom
   assert isinstance(relation, DizhiRelation), f'Unexpected type of relation: {type(relation)}'
   assert isinstance(dizhis, Sequence), "Non-sequence input loses the info of Dizhis' frequency."
   assert all(isinstance(dz, Dizhi) for dz in dizhis)
+  return _search(dizhis, relation)
 
-  if relation is DizhiRelation.三会:
-    return DizhiRelationCombos(combo for combo in DizhiRules.DIZHI_SANHUI if combo.issubset(dizhis))
-  
-  elif relation is DizhiRelation.六合:
-    return DizhiRelationCombos(combo for combo in DizhiRules.DIZHI_LIUHE if combo.issubset(dizhis))
-  
-  elif relation is DizhiRelation.暗合:
-    anhe_table: frozenset[DizhiCombo] = DizhiRules.DIZHI_ANHE[DizhiRules.AnheDef.NORMAL_EXTENDED] # Use `NORMAL_EXTENDED` here, which has the widest definition.
-    return DizhiRelationCombos(combo for combo in anhe_table if combo.issubset(dizhis))
-  
-  elif relation is DizhiRelation.通合:
-    return DizhiRelationCombos(combo for combo in DizhiRules.DIZHI_TONGHE if combo.issubset(dizhis))
-  
-  elif relation is DizhiRelation.通禄合:
-    return DizhiRelationCombos(combo for combo in DizhiRules.DIZHI_TONGLUHE if combo.issubset(dizhis))
-  
-  elif relation is DizhiRelation.三合:
-    return DizhiRelationCombos(combo for combo in DizhiRules.DIZHI_SANHE if combo.issubset(dizhis))
-  
-  elif relation is DizhiRelation.半合:
-    return DizhiRelationCombos(combo for combo in DizhiRules.DIZHI_BANHE if combo.issubset(dizhis))
-  
-  elif relation is DizhiRelation.刑:
-    dz_counter: Counter[Dizhi] = Counter(dizhis)
-
-    ret: set[DizhiCombo] = set()
-    for xing_tuple in DizhiRules.DIZHI_XING[DizhiRules.XingDef.LOOSE]:
-      # Sadly direct comparisons not implemented on `Counter` with Python 3.9.
-      # Otherwise we can use `dz_counter >= Counter(xing_tuple)` here.
-      xing_dz_counter: Counter[Dizhi] = Counter(xing_tuple)
-      if dz_counter & xing_dz_counter == xing_dz_counter:
-        ret.add(DizhiCombo(xing_tuple))
-
-    return DizhiRelationCombos(ret)
-  
-  elif relation is DizhiRelation.冲:
-    return DizhiRelationCombos(combo for combo in DizhiRules.DIZHI_CHONG if combo.issubset(dizhis))
-  
-  elif relation is DizhiRelation.破:
-    return DizhiRelationCombos(combo for combo in DizhiRules.DIZHI_PO if combo.issubset(dizhis))
-  
-  elif relation is DizhiRelation.害:
-    return DizhiRelationCombos(combo for combo in DizhiRules.DIZHI_HAI if combo.issubset(dizhis))
 
-  # Else, `relation` must be `生` or `克`.
-  assert relation is DizhiRelation.生 or relation is DizhiRelation.克
-  rules: frozenset[tuple[Dizhi, Dizhi]] = DizhiRules.DIZHI_KE if relation is DizhiRelation.克 else DizhiRules.DIZHI_SHENG
-  frozen_rules: frozenset[DizhiCombo] = frozenset(map(DizhiCombo, rules))
-  dz_set: set[Dizhi] = set(dizhis)
-  return DizhiRelationCombos(combo for combo in frozen_rules if all(dz in dz_set for dz in combo))
+def _search(dizhis: Sequence[Dizhi], relation: DizhiRelation) -> DizhiRelationCombos:
+  '''`search` without the input checks, for callers that have already validated the inputs.'''
+  if len(dizhis) < 2:
+    return () # Every combo needs at least two Dizhis (自刑 needs the same one twice). The empty tuple is a shared singleton.
+
+  if relation in _MASKED_COMBOS:
+    # Relations that only need every Dizhi of a combo to be present (i.e. all relations except 刑).
+    dz_mask: int = _mask(dizhis)
+    return DizhiRelationCombos(combo for combo, combo_mask in _MASKED_COMBOS[relation] if dz_mask & combo_mask == combo_mask)
+
+  # Else, `relation` must be `刑`, which also needs to know the Dizhis appearing more than once (自刑).
+  assert relation is DizhiRelation.刑
+  seen_mask: int = 0
+  dup_mask: int = 0
+  for dz in dizhis:
+    bit: int = _DIZHI_BIT[dz]
+    dup_mask |= seen_mask & bit
+    seen_mask |= bit
+
+  return DizhiRelationCombos(
+    combo for combo, combo_mask, combo_dup_mask in _MASKED_XING
+    if seen_mask & combo_mask == combo_mask and dup_mask & combo_dup_mask == combo_dup_mask
+  )
 
 
 def discover(dizhis: Sequence[Dizhi]) -> DizhiRelationDiscovery:
@@ -557,11 +605,17 @@ def discover(dizhis: Sequence[Dizhi]) -> DizhiRelationDiscovery:
   Return: (DizhiRelationDiscovery) The result containing all matching Dizhi combos. Note that returned combos don't reveal the directions.
   '''
 
+  assert isinstance(dizhis, Sequence), "Non-sequence input loses the info of Dizhis' frequency."
   assert all(isinstance(dz, Dizhi) for dz in dizhis)
+  return _discover(dizhis)
+
+
+def _discover(dizhis: Sequence[Dizhi]) -> DizhiRelationDiscovery:
+  '''`discover` without the input checks, for callers that have already validated the inputs.'''
   return DizhiRelationDiscovery({
     rel : result
     for rel in DizhiRelation
-    if len(result := search(dizhis, rel)) > 0
+    if len(result := _search(dizhis, rel)) > 0
   })
 
 
@@ -615,6 +669,6 @@ def discover_mutual(dizhis1: Sequence[Dizhi], dizhis2: Sequence[Dizhi]) -> Dizhi
   # Check each combo's validity and only keep valid ones.
   return DizhiRelationDiscovery({
     rel : result
-    for rel, combos in discover(list(dizhis1) + list(dizhis2)).items()
+    for rel, combos in _discover(list(dizhis1) + list(dizhis2)).items()
     if len(result := DizhiRelationCombos(filter(__is_valid, combos))) > 0
   })
@@ -1,8 +1,9 @@
 # Copyright (C) 2024 Ningqi Wang (0xf3cd) <https://github.com/0xf3cd>
 
-from typing import Sequence, Optional, Final, Callable
+from typing import Sequence, Optional, Final, Callable, Iterable
 
 from ..Defines import Tiangan, Wuxing, TianganRelation
+from ..Defines import _TIANGAN_INDEX # The ordinal table behind `Tiangan.index`. `Tiangan.index` 背后的序号表。
 from ..Common import frozendict
 from ..Rules import TianganRules
 
@@ -52,6 +53,48 @@ class TianganRelationDiscovery(frozendict[TianganRelation, TianganRelationCombos
 TianganRelationDiscoveryFilter = Callable[[TianganRelation, TianganCombo], bool]
 
 
+# Each Tiangan is encoded as one bit, so that a group of Tiangans (order and duplicates ignored) is an `int` bitmask.
+# Non-directional relations are then looked up by the bitmask, without building a frozenset per query.
+# A combo is contained in the input Tiangans iff `input_mask & combo_mask == combo_mask`.
+# 每个天干对应一个比特位，这样一组天干（不计顺序和重复）可以表示为一个整数位掩码。
+# 无方向的关系可以直接用位掩码查询，无需每次构造 frozenset。
+# 当且仅当 `input_mask & combo_mask == combo_mask` 时，输入天干包含该组合。
+_TIANGAN_BIT: Final[dict[Tiangan, int]] = { tg : 1 << idx for tg, idx in _TIANGAN_INDEX.items() }
+
+def _mask(tiangans: Iterable[Tiangan]) -> int:
+  mask: int = 0
+  for tg in tiangans:
+    mask |= _TIANGAN_BIT[tg]
+  return mask
+
+def _masked(combos: Iterable[TianganCombo]) -> tuple[tuple[TianganCombo, int], ...]:
+  '''Pair every combo with its bitmask, keeping the order of the rule table.'''
+  return tuple((combo, _mask(combo)) for combo in combos)
+
+_HE_BY_MASK: Final[dict[int, Wuxing]] = { _mask(combo) : wx for combo, wx in TianganRules.TIANGAN_HE.items() }
+_CHONG_MASKS: Final[frozenset[int]] = frozenset(_mask(combo) for combo in TianganRules.TIANGAN_CHONG)
+_MASKED_COMBOS: Final[dict[TianganRelation, tuple[tuple[TianganCombo, int], ...]]] = {
+  TianganRelation.合 : _masked(TianganRules.TIANGAN_HE),
+  TianganRelation.冲 : _masked(TianganRules.TIANGAN_CHONG),
+  # SHENG/KE are directional, but `search` ignores directions, so each pair is kept once as an unordered combo.
+  TianganRelation.生 : _masked(frozenset(map(TianganCombo, TianganRules.TIANGAN_SHENG))),
+  TianganRelation.克 : _masked(frozenset(map(TianganCombo, TianganRules.TIANGAN_KE))),
+}
+
+# Directional pair relations are stored as flat 10x10 `bytes` matrices, indexed by `index(tg1) * 10 + index(tg2)`.
+# 有方向的两两关系存储为 10x10 的扁平 `bytes` 矩阵，下标为 `index(tg1) * 10 + index(tg2)`。
+_TIANGAN_COUNT: Final[int] = len(_TIANGAN_INDEX)
+
+def _matrix(pairs: frozenset[tuple[Tiangan, Tiangan]]) -> bytes:
+  m: bytearray = bytearray(_TIANGAN_COUNT * _TIANGAN_COUNT)
+  for tg1, tg2 in pairs:
+    m[_TIANGAN_INDEX[tg1] * _TIANGAN_COUNT + _TIANGAN_INDEX[tg2]] = 1
+  return bytes(m)
+
+_SHENG_MATRIX: Final[bytes] = _matrix(TianganRules.TIANGAN_SHENG)
+_KE_MATRIX: Final[bytes] = _matrix(TianganRules.TIANGAN_KE)
+
+
 def he(tg1: Tiangan, tg2: Tiangan) -> Optional[Wuxing]:
   '''
   Check if the input two Tiangans are in HE relation. If so, return the corresponding Wuxing. If not, return `None`.
@@ -80,10 +123,7 @@ def he(tg1: Tiangan, tg2: Tiangan) -> Optional[Wuxing]:
   assert isinstance(tg1, Tiangan)
   assert isinstance(tg2, Tiangan)
 
-  fs: TianganCombo = TianganCombo((tg1, tg2))
-  if fs in TianganRules.TIANGAN_HE:
-    return TianganRules.TIANGAN_HE[fs]
-  return None
+  return _HE_BY_MASK.get(_TIANGAN_BIT[tg1] | _TIANGAN_BIT[tg2])
 
 
 def chong(tg1: Tiangan, tg2: Tiangan) -> bool:
@@ -110,7 +150,7 @@ def chong(tg1: Tiangan, tg2: Tiangan) -> bool:
 
   assert isinstance(tg1, Tiangan)
   assert isinstance(tg2, Tiangan)
-  return TianganCombo((tg1, tg2)) in TianganRules.TIANGAN_CHONG
+  return (_TIANGAN_BIT[tg1] | _TIANGAN_BIT[tg2]) in _CHONG_MASKS
 
 
 def sheng(tg1: Tiangan, tg2: Tiangan) -> bool:
@@ -137,7 +177,7 @@ def sheng(tg1: Tiangan, tg2: Tiangan) -> bool:
 
   assert isinstance(tg1, Tiangan)
   assert isinstance(tg2, Tiangan)
-  return (tg1, tg2) in TianganRules.TIANGAN_SHENG
+  return _SHENG_MATRIX[_TIANGAN_INDEX[tg1] * _TIANGAN_COUNT + _TIANGAN_INDEX[tg2]] == 1
 
 
 def ke(tg1: Tiangan, tg2: Tiangan) -> bool:
@@ -164,7 +204,7 @@ def ke(tg1: Tiangan, tg2: Tiangan) -> bool:
 
   assert isinstance(tg1, Tiangan)
   assert isinstance(tg2, Tiangan)
-  return (tg1, tg2) in TianganRules.TIANGAN_KE
+  return _KE_MATRIX[_TIANGAN_INDEX[tg1] * _TIANGAN_COUNT + _TIANGAN_INDEX[tg2]] == 1
 
 
 def search(tiangans: Sequence[Tiangan], relation: TianganRelation) -> TianganRelationCombos:
@@ -204,20 +244,16 @@ def search(tiangans: Sequence[Tiangan], relation: TianganRelation) -> TianganRel
 
   assert isinstance(relation, TianganRelation)
   assert all(isinstance(tg, Tiangan) for tg in tiangans)
+  return _search(tiangans, relation)
 
-  if relation is TianganRelation.合:
-    return TianganRelationCombos(combo for combo in TianganRules.TIANGAN_HE if combo.issubset(tiangans))
-  elif relation is TianganRelation.冲:
-    return TianganRelationCombos(combo for combo in TianganRules.TIANGAN_CHONG if combo.issubset(tiangans))
-  
-  # Otherwise, relation is `TianganRelation.生` or `TianganRelation.克`.
-  tg_set: Final[set[Tiangan]] = set(tiangans)
 
-  if relation is TianganRelation.生:
-    return TianganRelationCombos(TianganCombo(combo) for combo in TianganRules.TIANGAN_SHENG if tg_set.issuperset(combo))
-  else: 
-    assert relation is TianganRelation.克
-    return TianganRelationCombos(TianganCombo(combo) for combo in TianganRules.TIANGAN_KE if tg_set.issuperset(combo))
+def _search(tiangans: Sequence[Tiangan], relation: TianganRelation) -> TianganRelationCombos:
+  '''`search` without the input checks, for callers that have already validated the inputs.'''
+  if len(tiangans) < 2:
+    return () # Every combo has two Tiangans. The empty tuple is a shared singleton, so nothing is allocated.
+
+  tg_mask: int = _mask(tiangans)
+  return TianganRelationCombos(combo for combo, combo_mask in _MASKED_COMBOS[relation] if tg_mask & combo_mask == combo_mask)
 
 
 def discover(tiangans: Sequence[Tiangan]) -> TianganRelationDiscovery:
@@ -239,10 +275,15 @@ def discover(tiangans: Sequence[Tiangan]) -> TianganRelationDiscovery:
   '''
 
   assert all(isinstance(tg, Tiangan) for tg in tiangans)
+  return _discover(tiangans)
+
+
+def _discover(tiangans: Sequence[Tiangan]) -> TianganRelationDiscovery:
+  '''`discover` without the input checks, for callers that have already validated the inputs.'''
   return TianganRelationDiscovery({
     rel : result
     for rel in TianganRelation
-    if len(result := search(tiangans, rel)) > 0
+    if len(result := _search(tiangans, rel)) > 0
   })
 
 
@@ -292,6 +333,6 @@ def discover_mutual(tiangans1: Sequence[Tiangan], tiangans2: Sequence[Tiangan])
   # Check each combo's validity and only keep valid ones.
   return TianganRelationDiscovery({
     rel : result
-    for rel, combos in discover(list(tg1_set | tg2_set)).items()
+    for rel, combos in _discover(list(tg1_set | tg2_set)).items()
     if len(result := TianganRelationCombos(filter(__is_valid, combos))) > 0
   })
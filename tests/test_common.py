@@ -271,6 +271,10 @@ class TestCommon(unittest.TestCase):
     fd2[1].append(6)
     self.assertEqual(fd2[1], [2, 3])
 
+    # Immutable values are not copied. A deep copy of a frozendict would be a new object.
+    fd3: frozendict[str, frozendict[int, int]] = frozendict({'fd': frozendict({1: 2})})
+    self.assertIs(fd3['fd'], fd3['fd'])
+
   def test_pillardata(self) -> None:
     combo1: GanzhiData[str, int] = GanzhiData('a', 1)
     combo2: GanzhiData[str, int] = GanzhiData('a', 1)
@@ -1,6 +1,8 @@
 # Copyright (C) 2024 Ningqi Wang (0xf3cd) <https://github.com/0xf3cd>
 # test_defines.py
 
+import copy
+import pickle
 import unittest
 import random
 
@@ -318,6 +320,39 @@ class TestGanzhi(unittest.TestCase):
       self.assertIs(gz.tiangan, tg_list[i % 10])
       self.assertIs(gz.dizhi, dz_list[i % 12])
 
+  def test_sexagenary_cycle(self) -> None:
+    self.assertIsInstance(Ganzhi.sexagenary_cycle(), tuple)
+    self.assertIs(Ganzhi.sexagenary_cycle(), Ganzhi.sexagenary_cycle()) # Cached
+    self.assertEqual(list(Ganzhi.sexagenary_cycle()), Ganzhi.list_sexagenary_cycle())
+
+    # The returned list is a fresh copy - modifying it doesn't affect the cached cycle.
+    cycle: list[Ganzhi] = Ganzhi.list_sexagenary_cycle()
+    cycle.clear()
+    self.assertEqual(len(Ganzhi.list_sexagenary_cycle()), 60)
+
+  def test_hash(self) -> None:
+    # Tiangan/Dizhi/Wuxing are hashed by identity. Make sure lookups still work for members obtained in other ways.
+    tg_dict: dict[Tiangan, int] = {tg : idx for idx, tg in enumerate(Tiangan)}
+    for tg in Tiangan:
+      self.assertEqual(tg_dict[Tiangan.from_str(tg.value)], tg.index)
+      self.assertEqual(tg_dict[copy.deepcopy(tg)], tg.index)
+      self.assertEqual(tg_dict[pickle.loads(pickle.dumps(tg))], tg.index)
+
+    dz_dict: dict[Dizhi, int] = {dz : idx for idx, dz in enumerate(Dizhi)}
+    for dz in Dizhi:
+      self.assertEqual(dz_dict[Dizhi.from_str(dz.value)], dz.index)
+      self.assertEqual(dz_dict[copy.deepcopy(dz)], dz.index)
+      self.assertEqual(dz_dict[pickle.loads(pickle.dumps(dz))], dz.index)
+
+    wx_dict: dict[Wuxing, str] = {wx : wx.value for wx in Wuxing}
+    for wx in Wuxing:
+      self.assertEqual(wx_dict[Wuxing.from_str(wx.value)], wx.value)
+      self.assertEqual(wx_dict[copy.deepcopy(wx)], wx.value)
+      self.assertEqual(wx_dict[pickle.loads(pickle.dumps(wx))], wx.value)
+
+    self.assertEqual(len(set(Ganzhi.sexagenary_cycle())), 60)
+    self.assertIn(Ganzhi.from_str('甲子'), set(Ganzhi.sexagenary_cycle()))
+
   def test_list_sexagenary_cycle_strs(self) -> None:
     sexagenary_cycle_strs = Ganzhi.list_sexagenary_cycle_strs()
 
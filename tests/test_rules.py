@@ -2,9 +2,12 @@
 # test_rules.py
 
 import re
+import copy
 import inspect
 import unittest
+import itertools
 
+from src.Defines import Tiangan, Dizhi
 from src.Rules import BaziRules, TianganRules, DizhiRules, ShenshaRules
 
 class TestRules(unittest.TestCase):
@@ -24,6 +27,63 @@ class TestRules(unittest.TestCase):
     self.assertIs(DizhiRules.DIZHI_PO, DizhiRules.DIZHI_PO)
     self.assertIs(ShenshaRules.TAOHUA, ShenshaRules.TAOHUA)
 
+  def test_singleton_tables(self) -> None:
+    self.assertIs(DizhiRules.AnheTable(), DizhiRules.AnheTable())
+    self.assertIs(DizhiRules.AnheTable(), DizhiRules.DIZHI_ANHE)
+    self.assertIs(DizhiRules.XingTable(), DizhiRules.XingTable())
+    self.assertIs(DizhiRules.XingTable(), DizhiRules.DIZHI_XING)
+
+  def test_shared_traits(self) -> None:
+    # Tiangans and Dizhis with the same Wuxing and Yinyang share one `TraitTuple` object.
+    self.assertIs(BaziRules.TIANGAN_TRAITS[Tiangan.甲], BaziRules.DIZHI_TRAITS[Dizhi.寅])
+    self.assertIs(BaziRules.TIANGAN_TRAITS[Tiangan.癸], BaziRules.DIZHI_TRAITS[Dizhi.亥])
+    self.assertIs(BaziRules.DIZHI_TRAITS[Dizhi.辰], BaziRules.DIZHI_TRAITS[Dizhi.戌])
+    self.assertEqual(len({ id(t) for t in BaziRules.TIANGAN_TRAITS.values() }), 10)
+    self.assertEqual(len({ id(t) for t in BaziRules.DIZHI_TRAITS.values() }), 10)
+
+    # Copies of a `TraitTuple` are the object itself.
+    trait = BaziRules.TIANGAN_TRAITS[Tiangan.甲]
+    self.assertIs(copy.copy(trait), trait)
+    self.assertIs(copy.deepcopy(trait), trait)
+
+  def test_sheng_ke_tables(self) -> None:
+    # The SHENG/KE tables are written as literals. Rebuild them from the traits to make sure they are consistent.
+    tg_traits = BaziRules.TIANGAN_TRAITS
+    self.assertEqual(TianganRules.TIANGAN_SHENG, frozenset(
+      (tg1, tg2) for tg1, tg2 in itertools.product(Tiangan, Tiangan) if tg_traits[tg1].wuxing.generates(tg_traits[tg2].wuxing)
+    ))
+    self.assertEqual(TianganRules.TIANGAN_KE, frozenset(
+      (tg1, tg2) for tg1, tg2 in itertools.product(Tiangan, Tiangan) if tg_traits[tg1].wuxing.destructs(tg_traits[tg2].wuxing)
+    ))
+
+    dz_traits = BaziRules.DIZHI_TRAITS
+    self.assertEqual(DizhiRules.DIZHI_SHENG, frozenset(
+      (dz1, dz2) for dz1, dz2 in itertools.permutations(Dizhi, 2) if dz_traits[dz1].wuxing.generates(dz_traits[dz2].wuxing)
+    ))
+    self.assertEqual(DizhiRules.DIZHI_KE, frozenset(
+      (dz1, dz2) for dz1, dz2 in itertools.permutations(Dizhi, 2) if dz_traits[dz1].wuxing.destructs(dz_traits[dz2].wuxing)
+    ))
+
+  def test_xing_table_contents(self) -> None:
+    # The XING tables are written as literals. Rebuild them with the permutations to make sure nothing is missing.
+    strict: dict[tuple[Dizhi, ...], DizhiRules.XingSubType] = {}
+    for dz_tuple in itertools.permutations((Dizhi.丑, Dizhi.未, Dizhi.戌)):
+      strict[dz_tuple] = DizhiRules.XingSubType.三刑
+    for dz_tuple in itertools.permutations((Dizhi.寅, Dizhi.巳, Dizhi.申)):
+      strict[dz_tuple] = DizhiRules.XingSubType.三刑
+    for dz_tuple in itertools.permutations((Dizhi.子, Dizhi.卯)):
+      strict[dz_tuple] = DizhiRules.XingSubType.子卯刑
+    for dz in (Dizhi.午, Dizhi.辰, Dizhi.酉, Dizhi.亥):
+      strict[(dz, dz)] = DizhiRules.XingSubType.自刑
+    self.assertEqual(dict(DizhiRules.XingTable.strict), strict)
+
+    loose: dict[tuple[Dizhi, ...], DizhiRules.XingSubType] = dict(strict)
+    for dz_tuple in ((Dizhi.丑, Dizhi.戌), (Dizhi.戌, Dizhi.未), (Dizhi.未, Dizhi.丑)):
+      loose[dz_tuple] = DizhiRules.XingSubType.三刑
+    for dz_tuple in ((Dizhi.寅, Dizhi.巳), (Dizhi.巳, Dizhi.申), (Dizhi.申, Dizhi.寅)):
+      loose[dz_tuple] = DizhiRules.XingSubType.三刑
+    self.assertEqual(dict(DizhiRules.XingTable.loose), loose)
+
   def test_anhetable(self) -> None:
     # I just want `DizhiRules.AnheTable` to be a immutable Class...
     # Actually maybe this is an overkill because no one is going to change `DizhiRules.AnheTable`'s attributes...
@@ -44,6 +104,10 @@ class TestRules(unittest.TestCase):
     with self.assertRaises(TypeError):
       at[DizhiRules.AnheDef.MANGPAI] = '' # type: ignore
 
+    self.assertIs(at[DizhiRules.AnheDef.NORMAL], at.normal)
+    self.assertIs(at[DizhiRules.AnheDef.NORMAL_EXTENDED], at.normal_extended)
+    self.assertIs(at[DizhiRules.AnheDef.MANGPAI], at.mangpai)
+
   def test_xingtable(self) -> None:
     # I just want `DizhiRules.XingTable` to be a immutable Class...
     # Actually maybe this is an overkill because no one is going to change `DizhiRules.XingTable`'s attributes...
@@ -62,6 +126,9 @@ class TestRules(unittest.TestCase):
     with self.assertRaises(TypeError):
       xt[DizhiRules.XingDef.LOOSE] = '' # type: ignore
 
+    self.assertIs(xt[DizhiRules.XingDef.STRICT], xt.strict)
+    self.assertIs(xt[DizhiRules.XingDef.LOOSE], xt.loose)
+
   def test_all_rules(self) -> None:
     # I just want Rule classes to be immutable...
     # Actually maybe this is an overkill because no one is going to change their attributes...
@@ -6,6 +6,8 @@ import unittest
 import random
 import itertools
 from datetime import datetime
+from typing import Generator
+from unittest.mock import patch, PropertyMock
 
 from src.Common import DayunTuple
 from src.Defines import Ganzhi
@@ -24,6 +26,7 @@ class TestDayunDatabase(unittest.TestCase):
     db = DayunDatabase(chart)
 
     first_dayun: DayunTuple = next(chart.dayun)
+    self.assertEqual(db.first_dayun, first_dayun)
     for year in range(first_dayun.ganzhi_year, first_dayun.ganzhi_year + 10):
       self.assertEqual(db[year], DayunTuple(first_dayun.ganzhi_year, Ganzhi.from_str('己卯')))
     for year in range(first_dayun.ganzhi_year + 10, first_dayun.ganzhi_year + 20):
@@ -64,6 +67,7 @@ class TestTransitDatabase(unittest.TestCase):
       self.assertRaises(AssertionError, lambda: db.support('1999', TransitOptions.XIAOYUN)) # type: ignore
       self.assertRaises(AssertionError, lambda: db.support(1999, 'XIAOYUN')) # type: ignore
       self.assertRaises(AssertionError, lambda: db.support(1999, 0x1 | 0x4)) # type: ignore
+      self.assertRaises(AssertionError, lambda: db.support(1999, TransitOptions.XIAOYUN | TransitOptions.DAYUN))
 
       with self.subTest('Test ganzhi years before the birth year. Expect not to support.'):
         for gz_year in range(chart.bazi.ganzhi_date.year - 10, chart.bazi.ganzhi_date.year):
@@ -128,3 +132,27 @@ class TestTransitDatabase(unittest.TestCase):
           self.assertEqual(len(actual), len(transit_ganzhis))
           for gz in actual:
             self.assertIn(gz, transit_ganzhis)
+
+  def test_ganzhis_only_computes_selected_transits(self) -> None:
+    chart = BaziChart.random()
+    gz_year: int = chart.bazi.ganzhi_date.year + 500
+
+    # Count how many Dayuns are pulled from `chart.dayun`.
+    pulled: list[DayunTuple] = []
+    real_dayun: Generator[DayunTuple, None, None] = chart.dayun
+    def counting_dayun() -> Generator[DayunTuple, None, None]:
+      for dayun in real_dayun:
+        pulled.append(dayun)
+        yield dayun
+
+    with patch.object(BaziChart, 'dayun', new_callable=PropertyMock, return_value=counting_dayun()):
+      db: TransitDatabase = TransitDatabase(chart)
+
+    # A Liunian-only query should not generate any Dayun up to `gz_year`.
+    pulled_count: int = len(pulled)
+    self.assertEqual(db.ganzhis(gz_year, TransitOptions.LIUNIAN), (BaziUtils.ganzhi_of_year(gz_year),))
+    self.assertEqual(len(pulled), pulled_count)
+
+    # A Dayun query does.
+    db.ganzhis(gz_year, TransitOptions.DAYUN)
+    self.assertGreater(len(pulled), pulled_count)
@@ -1,14 +1,18 @@
 # Copyright (C) 2024 Ningqi Wang (0xf3cd) <https://github.com/0xf3cd>
 # test_bazi_utils.py
 
+import sys
 import random
+import subprocess
 import unittest
 import itertools
+from pathlib import Path
 from datetime import date, datetime, timedelta
 
 from src.Defines import Ganzhi, Tiangan, Dizhi, Wuxing, Yinyang, Shishen, ShierZhangsheng
 from src.Common import TraitTuple, HiddenTianganDict
 from src.Utils import BaziUtils
+from src.Rules import BaziRules
 
 
 class TestBaziUtils(unittest.TestCase):
@@ -38,6 +42,19 @@ class TestBaziUtils(unittest.TestCase):
         d = date(2024, 3, 1) + timedelta(days=offset)
         self.assertEqual(BaziUtils.ganzhi_of_day(d), Ganzhi.list_sexagenary_cycle()[offset % 60])
 
+  def test_ganzhi_of_days(self) -> None:
+    self.assertRaises(AssertionError, lambda: BaziUtils.ganzhi_of_days('2024-03-01', date(2024, 3, 1))) # type: ignore
+    self.assertEqual(BaziUtils.ganzhi_of_days(date(2024, 3, 2), date(2024, 3, 1)), ())
+    self.assertEqual(BaziUtils.ganzhi_of_days(date(2024, 3, 1), date(2024, 3, 1)), (Ganzhi.from_str('甲子'),))
+
+    for _ in range(20):
+      start: date = date(2024, 3, 1) + timedelta(days=random.randint(-50000, 50000))
+      end: date = start + timedelta(days=random.randint(0, 400))
+      ganzhis: tuple[Ganzhi, ...] = BaziUtils.ganzhi_of_days(start, end)
+      self.assertEqual(len(ganzhis), (end - start).days + 1)
+      for offset, gz in enumerate(ganzhis):
+        self.assertIs(gz, BaziUtils.ganzhi_of_day(start + timedelta(days=offset)))
+
   def test_ganzhi_of_year(self) -> None:
     self.assertRaises(AssertionError, lambda: BaziUtils.ganzhi_of_year('2024')) # type: ignore
     self.assertRaises(AssertionError, lambda: BaziUtils.ganzhi_of_year((2024,))) # type: ignore
@@ -56,12 +73,24 @@ class TestBaziUtils(unittest.TestCase):
       self.assertEqual(BaziUtils.ganzhi_of_year(another_random_ganzhi_year),
                        BaziUtils.ganzhi_of_year(random_ganzhi_year))
 
+    # The year 4 AD is a year of "甲子", so the Tiangan/Dizhi are simply `(year - 4) % 10` and `(year - 4) % 12`.
+    for gz_year in range(-200, 3001):
+      gz: Ganzhi = BaziUtils.ganzhi_of_year(gz_year)
+      self.assertIs(gz.tiangan, Tiangan.from_index((gz_year - 4) % 10))
+      self.assertIs(gz.dizhi, Dizhi.from_index((gz_year - 4) % 12))
+
   def test_month_tiangan(self) -> None:
     self.assertEqual(BaziUtils.month_tiangan(Tiangan.甲, Dizhi.寅), Tiangan.丙)
     self.assertEqual(BaziUtils.month_tiangan(Tiangan.壬, Dizhi.子), Tiangan.壬)
     self.assertEqual(BaziUtils.month_tiangan(Tiangan.丁, Dizhi.丑), Tiangan.癸)
     self.assertEqual(BaziUtils.month_tiangan(Tiangan.戊, Dizhi.巳), Tiangan.丁)
 
+    for tg in Tiangan:
+      for dz in Dizhi:
+        first_month_tg: Tiangan = BaziRules.YEAR_TO_MONTH_TABLE[tg]
+        expected: Tiangan = Tiangan.from_index((first_month_tg.index + (dz.index - Dizhi.寅.index) % 12) % 10)
+        self.assertIs(BaziUtils.month_tiangan(tg, dz), expected)
+
   def test_hour_tiangan(self) -> None:
     self.assertEqual(BaziUtils.hour_tiangan(Tiangan.甲, Dizhi.寅), Tiangan.丙)
     self.assertEqual(BaziUtils.hour_tiangan(Tiangan.壬, Dizhi.子), Tiangan.庚)
@@ -69,6 +98,11 @@ class TestBaziUtils(unittest.TestCase):
     self.assertEqual(BaziUtils.hour_tiangan(Tiangan.戊, Dizhi.巳), Tiangan.丁)
     self.assertEqual(BaziUtils.hour_tiangan(Tiangan.丙, Dizhi.卯), Tiangan.辛)
 
+    for tg in Tiangan:
+      for dz in Dizhi:
+        expected: Tiangan = Tiangan.from_index((BaziRules.DAY_TO_HOUR_TABLE[tg].index + dz.index) % 10)
+        self.assertIs(BaziUtils.hour_tiangan(tg, dz), expected)
+
   def test_tiangan_traits(self) -> None:
     for idx, tg in enumerate(Tiangan):
       expected_wuxing: Wuxing = Wuxing.as_list()[idx // 2]
@@ -99,6 +133,14 @@ class TestBaziUtils(unittest.TestCase):
       expected_yinyang: Yinyang = Yinyang.as_list()[idx % 2]
       self.assertEqual(BaziUtils.dizhi_traits(dz), TraitTuple(expected_wuxing, expected_yinyang))
 
+  def test_traits(self) -> None:
+    for tg in Tiangan:
+      self.assertIs(BaziUtils.traits(tg), BaziUtils.tiangan_traits(tg))
+    for dz in Dizhi:
+      self.assertIs(BaziUtils.traits(dz), BaziUtils.dizhi_traits(dz))
+    with self.assertRaises(AssertionError):
+      BaziUtils.traits(Wuxing.木) # type: ignore
+
   def test_hidden_tiangans(self) -> None:
     for dz in Dizhi:
       percentages: HiddenTianganDict = BaziUtils.hidden_tiangans(dz)
@@ -108,6 +150,30 @@ class TestBaziUtils(unittest.TestCase):
       for tg in percentages.keys():
         self.assertIn(tg, Tiangan)
 
+      # The dicts are immutable and shared, not copied per call.
+      self.assertIs(BaziUtils.hidden_tiangans(dz), percentages)
+      self.assertEqual(dict(percentages), dict(BaziRules.HIDDEN_TIANGANS[dz]))
+
+  def test_sum_hidden_tiangans(self) -> None:
+    self.assertEqual(len(BaziUtils.sum_hidden_tiangans([])), 0)
+    self.assertEqual(dict(BaziUtils.sum_hidden_tiangans([Dizhi.子, Dizhi.丑])), {
+      Tiangan.己 : 60, Tiangan.辛 : 10, Tiangan.癸 : 130,
+    })
+
+    for _ in range(100):
+      dizhis: list[Dizhi] = random.choices(list(Dizhi), k=random.randint(1, 8))
+      expected: dict[Tiangan, int] = {}
+      for dz in dizhis:
+        for tg, percentage in BaziUtils.hidden_tiangans(dz).items():
+          expected[tg] = expected.get(tg, 0) + percentage
+      self.assertEqual(dict(BaziUtils.sum_hidden_tiangans(dizhis)), expected)
+      self.assertEqual(sum(BaziUtils.sum_hidden_tiangans(dizhis).values()), 100 * len(dizhis))
+
+    with self.assertRaises(AssertionError):
+      BaziUtils.sum_hidden_tiangans(['子']) # type: ignore
+    with self.assertRaises(AssertionError):
+      BaziUtils.sum_hidden_tiangans(dz for dz in [Dizhi.子, Dizhi.丑]) # type: ignore
+
   def test_shishen(self) -> None:
     self.assertEqual(BaziUtils.shishen(Tiangan.甲, Tiangan.甲), Shishen.比肩)
     self.assertEqual(BaziUtils.shishen(Tiangan.甲, Tiangan.乙), Shishen.劫财)
@@ -126,6 +192,17 @@ class TestBaziUtils(unittest.TestCase):
     self.assertEqual(BaziUtils.shishen(Tiangan.甲, Tiangan.壬), Shishen.偏印)
     self.assertEqual(BaziUtils.shishen(Tiangan.甲, Dizhi.子), Shishen.正印)
 
+    for dm in Tiangan:
+      # Each of the 10 Tiangans maps to a distinct Shishen for any day master.
+      self.assertEqual(len({ BaziUtils.shishen(dm, tg) for tg in Tiangan }), 10)
+      # A Dizhi takes the Shishen of its main hidden Tiangan (主气).
+      for dz in Dizhi:
+        main_tg: Tiangan = max(BaziUtils.hidden_tiangans(dz).items(), key=lambda kv: kv[1])[0]
+        self.assertIs(BaziUtils.shishen(dm, dz), BaziUtils.shishen(dm, main_tg))
+
+    self.assertRaises(AssertionError, lambda: BaziUtils.shishen(Dizhi.子, Tiangan.甲)) # type: ignore
+    self.assertRaises(AssertionError, lambda: BaziUtils.shishen(Tiangan.甲, '甲')) # type: ignore
+
   def test_nayin_str(self) -> None:
     self.assertEqual(BaziUtils.nayin_str(Ganzhi.from_str('甲子')), '海中金')
     self.assertEqual(BaziUtils.nayin_str(Ganzhi.from_str('乙丑')), '海中金')
@@ -150,6 +227,12 @@ class TestBaziUtils(unittest.TestCase):
           with self.assertRaises(AssertionError):
             BaziUtils.nayin_str(gz) # Ganzhis not in the sexagenary cycle don't have nayin.
 
+    # With asserts stripped (`python -O`), an invalid Ganzhi must still fail loudly rather than return some Nayin.
+    code: str = 'from src.Defines import Ganzhi\nfrom src.Utils import BaziUtils\nBaziUtils.nayin_str(Ganzhi.from_str("甲丑"))'
+    proc = subprocess.run([sys.executable, '-O', '-c', code], cwd=Path(__file__).parents[2], capture_output=True, text=True)
+    self.assertNotEqual(proc.returncode, 0)
+    self.assertIn('KeyError', proc.stderr)
+
   def test_12zhangsheng(self) -> None:
     self.assertEqual(BaziUtils.shier_zhangsheng(*Ganzhi.from_str('甲子')), ShierZhangsheng.沐浴)
     self.assertEqual(BaziUtils.shier_zhangsheng(*Ganzhi.from_str('甲亥')), ShierZhangsheng.长生)